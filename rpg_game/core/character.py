@@ -8,6 +8,7 @@ Version: 1.0.0
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional, Any, Set, TYPE_CHECKING, Union
+from functools import lru_cache
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -566,6 +567,29 @@ CLASS_ABILITIES = {
 }
 
 
+# =============================================================================
+# RESOURCE BARS
+# =============================================================================
+
+_BAR_20 = tuple("█" * i + "░" * (20 - i) for i in range(21))
+
+
+@lru_cache(maxsize=None)
+def _bar(width: int, filled: int) -> str:
+    """Bar string for widths without a prebuilt table"""
+    return "█" * filled + "░" * (width - filled)
+
+
+def _render_bar(current: int, maximum: int, width: int) -> str:
+    """Get the filled/empty bar for current out of maximum"""
+    filled = (current * width) // maximum if maximum > 0 else 0
+    if filled < 0:
+        filled = 0
+    elif filled > width:
+        filled = width
+    return _BAR_20[filled] if width == 20 else _bar(width, filled)
+
+
 # =============================================================================
 # CHARACTER CLASS
 # =============================================================================
@@ -823,28 +847,19 @@ class Character(Entity):
     
     def get_hp_bar(self, width: int = 20) -> str:
         """Get HP bar string"""
-        filled = int((self.current_hp / self.max_hp) * width)
-        bar = "█" * filled + "░" * (width - filled)
-        return f"[{bar}] {self.current_hp}/{self.max_hp}"
+        return f"[{_render_bar(self.current_hp, self.max_hp, width)}] {self.current_hp}/{self.max_hp}"
     
     def get_mp_bar(self, width: int = 20) -> str:
         """Get MP bar string"""
-        filled = int((self.current_mp / self.max_mp) * width) if self.max_mp > 0 else 0
-        bar = "█" * filled + "░" * (width - filled)
-        return f"[{bar}] {self.current_mp}/{self.max_mp}"
+        return f"[{_render_bar(self.current_mp, self.max_mp, width)}] {self.current_mp}/{self.max_mp}"
     
     def get_stamina_bar(self, width: int = 20) -> str:
         """Get stamina bar string"""
-        filled = int((self.current_stamina / self.max_stamina) * width)
-        bar = "█" * filled + "░" * (width - filled)
-        return f"[{bar}] {self.current_stamina}/{self.max_stamina}"
+        return f"[{_render_bar(self.current_stamina, self.max_stamina, width)}] {self.current_stamina}/{self.max_stamina}"
     
     def get_exp_bar(self, width: int = 20) -> str:
         """Get experience bar string"""
-        percent = self.experience / self.experience_to_level if self.experience_to_level > 0 else 0
-        filled = int(percent * width)
-        bar = "█" * filled + "░" * (width - filled)
-        return f"[{bar}] {self.experience}/{self.experience_to_level}"
+        return f"[{_render_bar(self.experience, self.experience_to_level, width)}] {self.experience}/{self.experience_to_level}"
     
     def get_status_display(self) -> str:
         """Get character status display"""
@@ -966,6 +981,7 @@ class Inventory:
         self.max_weight = max_weight
         self.items: List[Item] = []
         self.gold: int = 0
+        self._consumables: Optional[List[Item]] = None
     
     def add_item(self, item: Item) -> Tuple[bool, str]:
         """Add an item to inventory"""
@@ -973,6 +989,7 @@ class Inventory:
             if len(self.items) >= self.max_slots:
                 return False, "Inventory is full!"
             self.items.append(item)
+            self._consumables = None
             return True, f"Added {item.name} to inventory."
         
         # Check for existing stack
@@ -987,6 +1004,7 @@ class Inventory:
                     item.quantity -= space
                     if len(self.items) < self.max_slots:
                         self.items.append(item)
+                        self._consumables = None
                         return True, f"Stack filled, added remaining {item.quantity}x {item.name}."
                     return False, "Inventory is full!"
         
@@ -994,6 +1012,7 @@ class Inventory:
             return False, "Inventory is full!"
         
         self.items.append(item)
+        self._consumables = None
         return True, f"Added {item.quantity}x {item.name}."
     
     def remove_item(self, item_name: str, quantity: int = 1) -> Tuple[bool, Optional[Item]]:
@@ -1002,13 +1021,38 @@ class Inventory:
             if item.name.lower() == item_name.lower():
                 if item.quantity <= quantity:
                     self.items.pop(i)
+                    self._consumables = None
                     return True, item
                 else:
                     item.quantity -= quantity
-                    new_item = get_item(item.name.lower().replace(" ", "_"), quantity)
+                    new_item = get_item(item.item_id, quantity)
                     return True, new_item
         return False, None
     
+    def discard(self, item: Item) -> bool:
+        """Remove a specific item object from the inventory"""
+        for i, existing in enumerate(self.items):
+            if existing is item:
+                self.discard_at(i)
+                return True
+        return False
+    
+    def discard_at(self, index: int) -> Item:
+        """Remove and return the item at a position in the inventory"""
+        item = self.items.pop(index)
+        self._consumables = None
+        return item
+    
+    @property
+    def consumables(self) -> List[Item]:
+        """Usable consumables, rebuilt only after the item list changes"""
+        if self._consumables is None:
+            self._consumables = [
+                item for item in self.items
+                if isinstance(item, Consumable) and item.usable
+            ]
+        return self._consumables
+    
     def get_item(self, item_name: str) -> Optional[Item]:
         """Get item by name"""
         for item in self.items:
@@ -1125,6 +1169,7 @@ class Inventory:
             item = ItemFactory.create_item(item_data)
             if item:
                 inv.items.append(item)
+        inv._consumables = None
         return inv
 
 
@@ -10,6 +10,7 @@ from __future__ import annotations
 import random
 import time
 import os
+import sys
 import hashlib
 from dataclasses import dataclass, field
 from typing import (
@@ -25,6 +26,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Dataclass options for slotted records; slots=True needs Python 3.10+
+DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 # =============================================================================
 # ENUMERATIONS
@@ -367,7 +371,7 @@ class Damage:
         return actual_damage
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CombatLog:
     """Log entry for combat"""
     turn: int
@@ -407,10 +411,23 @@ class Item(GameObject):
     usable: bool = False
     equippable: bool = False
     
+    # Memo for item_id, keyed by the name it was derived from
+    _item_id_name = None
+    _item_id = ""
+    
     def __post_init__(self):
         if not self.id:
             self.id = hashlib.md5(f"{self.name}{time.time()}".encode()).hexdigest()[:8]
     
+    @property
+    def item_id(self) -> str:
+        """Get the database ID derived from the item name"""
+        name = self.name
+        if name is not self._item_id_name:
+            self._item_id = name.lower().replace(" ", "_")
+            self._item_id_name = name
+        return self._item_id
+    
     def get_value(self) -> int:
         """Get total value including quantity"""
         return self.value * self.quantity
@@ -460,6 +477,11 @@ class Ability:
     critical_modifier: float = 0.0
     requirements: Dict[str, Any] = field(default_factory=dict)
     
+    def __post_init__(self):
+        # Ability parameters are fixed once constructed, so use() runs a
+        # version specialized for them
+        self._use_impl = _compile_ability_use(self)
+    
     def can_use(self, user: 'Entity') -> Tuple[bool, str]:
         """Check if ability can be used"""
         if self.current_cooldown > 0:
@@ -485,64 +507,7 @@ class Ability:
     
     def use(self, user: 'Entity', target: Optional['Entity'] = None) -> Dict[str, Any]:
         """Use the ability"""
-        can_use, msg = self.can_use(user)
-        if not can_use:
-            return {"success": False, "message": msg}
-        
-        # Pay costs
-        user.current_mp -= self.mp_cost
-        user.current_stamina -= self.stamina_cost
-        user.current_hp -= self.hp_cost
-        self.current_cooldown = self.cooldown
-        
-        result = {
-            "success": True,
-            "message": f"{user.name} uses {self.name}!",
-            "damage_dealt": 0,
-            "healing_done": 0,
-            "effects_applied": [],
-            "messages": []
-        }
-        
-        # Apply damage
-        if self.damage > 0 and target:
-            is_critical = random.random() < (user.get_critical_chance() + self.critical_modifier)
-            damage_amount = self.damage
-            
-            if is_critical:
-                damage_amount = int(damage_amount * 1.5)
-            
-            damage = Damage(
-                amount=damage_amount,
-                damage_type=self.damage_type or DamageType.PHYSICAL,
-                is_critical=is_critical,
-                source=self.name
-            )
-            
-            actual_damage = damage.apply(target)
-            result["damage_dealt"] = actual_damage
-            result["messages"].append(f"Dealt {actual_damage} damage!")
-            
-            if is_critical:
-                result["messages"].append("Critical hit!")
-        
-        # Apply healing
-        if self.healing > 0:
-            heal_amount = self.healing
-            user.heal(heal_amount)
-            result["healing_done"] = heal_amount
-            result["messages"].append(f"Healed for {heal_amount} HP!")
-        
-        # Apply effects
-        for effect_type, duration, strength in self.effects:
-            if target:
-                target.apply_status_effect(effect_type, duration, strength)
-            else:
-                user.apply_status_effect(effect_type, duration, strength)
-            result["effects_applied"].append(effect_type.value)
-            result["messages"].append(f"{target.name if target else user.name} is afflicted with {effect_type.value}!")
-        
-        return result
+        return self._use_impl(self, user, target)
     
     def end_turn(self):
         """Reduce cooldown at end of turn"""
@@ -597,6 +562,103 @@ class Ability:
         )
 
 
+_ABILITY_USE_SOURCE = """
+def _use(ability, user, target=None):
+    can_use, msg = ability.can_use(user)
+    if not can_use:
+        return {{"success": False, "message": msg}}
+    
+{costs}    ability.current_cooldown = {cooldown!r}
+    
+    messages = []
+    result = {{
+        "success": True,
+        "message": user.name + USES_SUFFIX,
+        "damage_dealt": 0,
+        "healing_done": 0,
+        "effects_applied": [],
+        "messages": messages
+    }}
+{body}    return result
+"""
+
+_ABILITY_DAMAGE_SOURCE = """    if target:
+        is_critical = random() < (user.get_critical_chance() + {critical_modifier!r})
+        damage = Damage(
+            amount={critical_damage!r} if is_critical else {damage!r},
+            damage_type=DAMAGE_TYPE,
+            is_critical=is_critical,
+            source=NAME
+        )
+        actual_damage = damage.apply(target)
+        result["damage_dealt"] = actual_damage
+        messages.append(f"Dealt {{actual_damage}} damage!")
+        if is_critical:
+            messages.append("Critical hit!")
+"""
+
+_ABILITY_HEALING_SOURCE = """    user.heal({healing!r})
+    result["healing_done"] = {healing!r}
+    messages.append("Healed for {healing} HP!")
+"""
+
+_ABILITY_EFFECTS_SOURCE = """    recipient = target if target else user
+    for effect_type, duration, strength in EFFECTS:
+        recipient.apply_status_effect(effect_type, duration, strength)
+        result["effects_applied"].append(effect_type.value)
+        messages.append(f"{recipient.name} is afflicted with {effect_type.value}!")
+"""
+
+_ABILITY_USE_CACHE: Dict[Tuple, Any] = {}
+
+
+def _compile_ability_use(ability: Ability):
+    """Build (or reuse) a use() implementation with the ability's parameters inlined"""
+    effects = tuple(tuple(e) for e in ability.effects)
+    damage_type = ability.damage_type or DamageType.PHYSICAL
+    key = (
+        ability.name, ability.mp_cost, ability.stamina_cost, ability.hp_cost,
+        ability.cooldown, ability.damage, damage_type, ability.critical_modifier,
+        ability.healing, effects
+    )
+    use = _ABILITY_USE_CACHE.get(key)
+    if use is not None:
+        return use
+    
+    costs = ""
+    if ability.mp_cost:
+        costs += f"    user.current_mp -= {ability.mp_cost!r}\n"
+    if ability.stamina_cost:
+        costs += f"    user.current_stamina -= {ability.stamina_cost!r}\n"
+    if ability.hp_cost:
+        costs += f"    user.current_hp -= {ability.hp_cost!r}\n"
+    
+    body = ""
+    if ability.damage > 0:
+        body += _ABILITY_DAMAGE_SOURCE.format(
+            critical_modifier=ability.critical_modifier,
+            damage=ability.damage,
+            critical_damage=int(ability.damage * 1.5)
+        )
+    if ability.healing > 0:
+        body += _ABILITY_HEALING_SOURCE.format(healing=ability.healing)
+    if effects:
+        body += _ABILITY_EFFECTS_SOURCE
+    
+    namespace = {
+        "random": random.random,
+        "Damage": Damage,
+        "DAMAGE_TYPE": damage_type,
+        "NAME": ability.name,
+        "USES_SUFFIX": f" uses {ability.name}!",
+        "EFFECTS": effects
+    }
+    source = _ABILITY_USE_SOURCE.format(costs=costs, cooldown=ability.cooldown, body=body)
+    exec(compile(source, f"<ability:{ability.name}>", "exec"), namespace)
+    use = _ABILITY_USE_CACHE[key] = namespace["_use"]
+    return use
+
+
 class Entity(GameObject):
     """Base entity class for characters and enemies"""
     
@@ -720,6 +782,11 @@ class Entity(GameObject):
         """Take damage"""
         return damage.apply(self)
     
+    @property
+    def status_effects_active(self) -> bool:
+        """Whether any status effect needs processing this turn"""
+        return bool(self.status_effects)
+    
     def apply_status_effect(self, effect_type: StatusEffectType, duration: int, strength: int = 1):
         """Apply a status effect"""
         self.status_effects[effect_type] = {
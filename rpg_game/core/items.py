@@ -8,6 +8,7 @@ Version: 1.0.0
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING
+from functools import lru_cache
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -777,18 +778,24 @@ def get_item(item_id: str, quantity: int = 1) -> Optional[Item]:
     return ItemFactory.create_item(data)
 
 
-def get_random_item(rarity: Optional[Rarity] = None, item_type: Optional[ItemType] = None) -> Optional[Item]:
-    """Get a random item from the database"""
-    import random
-    
+@lru_cache(maxsize=None)
+def _random_item_candidates(rarity: Optional[Rarity], item_type: Optional[ItemType]) -> Tuple[str, ...]:
+    """Item IDs matching a rarity/type filter; cleared when ITEM_DATABASE changes"""
     candidates = []
     for item_id, data in ITEM_DATABASE.items():
-        if rarity and Rarity(data.get("rarity", "Common")) != rarity:
+        if rarity and ItemFactory._parse_rarity(data.get("rarity")) != rarity:
             continue
         if item_type and ItemType(data.get("item_type", "material")) != item_type:
             continue
         candidates.append(item_id)
+    return tuple(candidates)
+
+
+def get_random_item(rarity: Optional[Rarity] = None, item_type: Optional[ItemType] = None) -> Optional[Item]:
+    """Get a random item from the database"""
+    import random
     
+    candidates = _random_item_candidates(rarity, item_type)
     if not candidates:
         return None
     
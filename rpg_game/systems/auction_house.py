@@ -300,7 +300,7 @@ class AuctionHouse:
             id=listing_id,
             seller_id=seller.id,
             seller_name=seller.name,
-            item_id=item.name.lower().replace(" ", "_"),
+            item_id=item.item_id,
             item_name=item.name,
             item_rarity=item.rarity.name,
             quantity=item.quantity,
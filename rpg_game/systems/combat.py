@@ -6,9 +6,10 @@ Version: 1.0.0
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import List, Optional, Any, TYPE_CHECKING
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any, Callable, Sequence, TYPE_CHECKING
 from enum import Enum
+from functools import lru_cache
 import sys
 import os
 import random
@@ -18,12 +19,15 @@ from core.engine import (
     Entity, Damage, DamageType, StatusEffectType, Ability,
     AbilityType, TargetType,
     StatType, CombatLog, EventType, clamp,
-    colored_text, print_border, pause
+    colored_text, DATACLASS_SLOTS
 )
 
 if TYPE_CHECKING:
     from core.character import Character
 
+# Bound once so hot paths skip the module attribute lookup
+_random = random.random
+
 
 class CombatState(Enum):
     INIT = "init"
@@ -34,20 +38,54 @@ class CombatState(Enum):
     FLED = "fled"
 
 
-@dataclass
+_TERMINAL_STATES = frozenset({CombatState.VICTORY, CombatState.DEFEAT, CombatState.FLED})
+
+
+@dataclass(**DATACLASS_SLOTS)
 class CombatResult:
     """Result of a combat encounter"""
     victory: bool
     fled: bool = False
     experience_gained: int = 0
     gold_gained: int = 0
-    items_dropped: List[Any] = field(default_factory=list)
+    items_dropped: Sequence[Any] = ()
     turns_elapsed: int = 0
     damage_dealt: int = 0
     damage_taken: int = 0
     abilities_used: int = 0
 
 
+# ============================================================================
+# DISPLAY CONSTANTS
+# ============================================================================
+
+_SEP60 = "=" * 60
+_ENCOUNTER_BANNER = f"{_SEP60}\n" + colored_text("COMBAT ENCOUNTER!", "\033[91m") + f"\n{_SEP60}\n"
+_ENEMY_TURN_HEADER = f"\n{_SEP60}\nENEMY TURN\n{_SEP60}\n"
+_PLAYER_CRIT_TAG = colored_text("CRITICAL HIT!", "\033[93m") + "\n"
+_ENEMY_CRIT_TAG = colored_text("Enemy critical hit!", "\033[91m") + "\n"
+_FLED_TAG = colored_text("You successfully fled!", "\033[92m") + "\n"
+_FLEE_FAILED_TAG = colored_text("Failed to flee!", "\033[91m") + "\n"
+_DEFEAT_TAG = colored_text("You have been defeated!", "\033[91m") + "\n"
+
+
+_ENEMY_CRIT_CHANCE = 0.05
+_MISS = (False, False, 0)
+
+
+def _resolve_enemy_attacks(
+    attack: List[int], hit_rolls: List[float], crit_rolls: List[float], hit_chance: int
+) -> List[Tuple[bool, bool, int]]:
+    """Resolve (hit, critical, damage) for a batch of enemy basic attacks"""
+    threshold = hit_chance / 100
+    return [
+        _MISS if hit_roll >= threshold
+        else (True, True, int(power * 1.5)) if crit_roll < _ENEMY_CRIT_CHANCE
+        else (True, False, power)
+        for power, hit_roll, crit_roll in zip(attack, hit_rolls, crit_rolls)
+    ]
+
+
 class CombatEncounter:
     """Manages a combat encounter"""
     
@@ -59,8 +97,61 @@ class CombatEncounter:
         self.logs: List[CombatLog] = []
         self.event_system = event_system
         
+        # Living enemies and their attack power, kept in step as enemies fall
+        self._living: List[Entity] = [e for e in enemies if e.is_alive]
+        self._living_attack: List[int] = [e.get_attack_power() for e in self._living]
+        self._defeated_level_sum = sum(e.level for e in enemies if not e.is_alive)
+        
+        self._dispatch: Dict[CombatState, Callable[[], CombatState]] = {
+            CombatState.PLAYER_TURN: self._player_phase,
+            CombatState.ENEMY_TURN: self._enemy_phase
+        }
+        
+        # Output is buffered per turn and written in one go
+        self._out: List[str] = []
+        self._p = self._out.append
+        
+        # Source of player choices; start() binds the console
+        self._decide: Callable[[str], str] = input
+        
+    def _flush(self):
+        """Write buffered combat output to stdout"""
+        if self._out:
+            sys.stdout.write("".join(self._out))
+            sys.stdout.flush()
+            self._out.clear()
+    
+    def _input(self, prompt: str) -> str:
+        """Flush pending output, then read the player's choice"""
+        self._flush()
+        return self._decide(prompt)
+    
+    def _mark_defeated(self, enemy: Entity):
+        """Drop a defeated enemy from the living roster"""
+        for k, living in enumerate(self._living):
+            if living is enemy:
+                del self._living[k]
+                del self._living_attack[k]
+                self._defeated_level_sum += enemy.level
+                return
+    
+    def _player_phase(self) -> CombatState:
+        """Run the player's turn and return the next state"""
+        return CombatState.FLED if self._player_turn() else CombatState.ENEMY_TURN
+    
+    def _enemy_phase(self) -> CombatState:
+        """Run the enemies' turn, close the round and return the next state"""
+        self._enemy_turn()
+        self.turn += 1
+        return CombatState.PLAYER_TURN
+    
     def start(self) -> CombatResult:
         """Start the combat encounter"""
+        return self.run(input)
+    
+    def run(self, decide: Callable[[str], str]) -> CombatResult:
+        """Run the combat encounter, asking decide(prompt) for each choice"""
+        self._decide = decide
         self.state = CombatState.PLAYER_TURN
         self.turn = 1
         
@@ -70,44 +161,42 @@ class CombatEncounter:
         self._display_intro()
         
         if self.event_system:
+            self._flush()
             self.event_system.emit(EventType.COMBAT_START, {
                 "player": self.player,
                 "enemies": self.enemies
             })
         
-        while self.state not in [CombatState.VICTORY, CombatState.DEFEAT, CombatState.FLED]:
+        while self.state not in _TERMINAL_STATES:
             # Process turn
-            if self.state == CombatState.PLAYER_TURN:
-                fled = self._player_turn()
-                if fled:
-                    self.state = CombatState.FLED
-                    result.fled = True
-                    break
-            elif self.state == CombatState.ENEMY_TURN:
-                self._enemy_turn()
+            handler = self._dispatch.get(self.state)
+            if handler is None:
+                break
+            next_state = handler()
+            if next_state is CombatState.FLED:
+                self.state = next_state
+                result.fled = True
+                break
             
             # Check victory/defeat conditions
             if not self.player.is_alive:
                 self.state = CombatState.DEFEAT
                 break
             
-            alive_enemies = [e for e in self.enemies if e.is_alive]
-            if not alive_enemies:
+            if not self._living:
                 self.state = CombatState.VICTORY
                 break
             
             # Switch turns
-            if self.state == CombatState.PLAYER_TURN:
-                self.state = CombatState.ENEMY_TURN
-            else:
-                self.state = CombatState.PLAYER_TURN
-                self.turn += 1
+            self.state = next_state
             
             # Process status effects
             self._process_status_effects()
         
+        self._flush()
+        
         # Calculate results
-        if self.state == CombatState.VICTORY:
+        if self.state is CombatState.VICTORY:
             result.victory = True
             result.experience_gained = self._calculate_experience()
             result.gold_gained = self._calculate_gold()
@@ -126,42 +215,37 @@ class CombatEncounter:
     
     def _display_intro(self):
         """Display combat introduction"""
-        print_border()
-        print(colored_text("COMBAT ENCOUNTER!", "\033[91m"))
-        print_border()
-        print(f"\nYou face {len(self.enemies)} enemy(s):")
+        self._p(_ENCOUNTER_BANNER)
+        self._p(f"\nYou face {len(self.enemies)} enemy(s):\n")
         for enemy in self.enemies:
-            print(f"  • {enemy.name} (Level {enemy.level})")
-        print()
-        pause()
+            self._p(f"  • {enemy.name} (Level {enemy.level})\n")
+        self._p("\n")
+        self._input("Press Enter to continue...")
     
     def _player_turn(self) -> bool:
         """Process player turn"""
-        print(f"\n{'='*60}")
-        print(f"TURN {self.turn} - YOUR TURN")
-        print(f"{'='*60}")
-        print(f"HP: {self.player.current_hp}/{self.player.max_hp}")
-        print(f"MP: {self.player.current_mp}/{self.player.max_mp}")
-        print(f"Stamina: {self.player.current_stamina}/{self.player.max_stamina}")
+        self._p(f"\n{_SEP60}\nTURN {self.turn} - YOUR TURN\n{_SEP60}\n")
+        self._p(f"HP: {self.player.current_hp}/{self.player.max_hp}\n")
+        self._p(f"MP: {self.player.current_mp}/{self.player.max_mp}\n")
+        self._p(f"Stamina: {self.player.current_stamina}/{self.player.max_stamina}\n")
         
         # Show enemies
-        print("\nEnemies:")
-        for i, enemy in enumerate(self.enemies, 1):
-            if enemy.is_alive:
-                status = ""
-                if enemy.status_effects:
-                    status = f" [{', '.join(e.value for e in enemy.status_effects.keys())}]"
-                print(f"  [{i}] {enemy.name} - HP: {enemy.current_hp}/{enemy.max_hp}{status}")
+        self._p("\nEnemies:\n")
+        for i, enemy in enumerate(self._living, 1):
+            status = ""
+            if enemy.status_effects:
+                status = f" [{', '.join(e.value for e in enemy.status_effects.keys())}]"
+            self._p(f"  [{i}] {enemy.name} - HP: {enemy.current_hp}/{enemy.max_hp}{status}\n")
         
         # Get player action
-        print("\nActions:")
-        print("  [1] Attack")
-        print("  [2] Ability")
-        print("  [3] Item")
-        print("  [4] Defend")
-        print("  [5] Flee")
+        self._p("\nActions:\n")
+        self._p("  [1] Attack\n")
+        self._p("  [2] Ability\n")
+        self._p("  [3] Item\n")
+        self._p("  [4] Defend\n")
+        self._p("  [5] Flee\n")
         
-        choice = input("\nChoose action (1-5): ").strip()
+        choice = self._input("\nChoose action (1-5): ").strip()
         
         if choice == "1":
             self._player_attack()
@@ -174,23 +258,24 @@ class CombatEncounter:
         elif choice == "5":
             return self._player_flee()
         else:
-            print("Invalid choice!")
+            self._p("Invalid choice!\n")
         
+        self._flush()
         return False
     
     def _player_attack(self):
         """Player basic attack"""
         # Select target
-        alive_enemies = [e for e in self.enemies if e.is_alive]
+        alive_enemies = self._living
         if not alive_enemies:
             return
         
-        print("\nSelect target:")
+        self._p("\nSelect target:\n")
         for i, enemy in enumerate(alive_enemies, 1):
-            print(f"  [{i}] {enemy.name}")
+            self._p(f"  [{i}] {enemy.name}\n")
         
         try:
-            target_idx = int(input("Target: ").strip()) - 1
+            target_idx = int(self._input("Target: ").strip()) - 1
             if 0 <= target_idx < len(alive_enemies):
                 target = alive_enemies[target_idx]
                 
@@ -198,14 +283,14 @@ class CombatEncounter:
                 hit_chance = self.player.get_accuracy() - target.get_evasion()
                 hit_chance = clamp(hit_chance, 5, 95)
                 
-                if random.randint(1, 100) <= hit_chance:
+                if _random() * 100 < hit_chance:
                     # Hit!
-                    is_critical = random.random() < self.player.get_critical_chance()
+                    is_critical = _random() < self.player.get_critical_chance()
                     damage = self.player.get_attack_power()
                     
                     if is_critical:
                         damage = int(damage * 1.5)
-                        print(colored_text("CRITICAL HIT!", "\033[93m"))
+                        self._p(_PLAYER_CRIT_TAG)
                     
                     # Apply damage
                     dmg = Damage(
@@ -215,38 +300,39 @@ class CombatEncounter:
                     )
                     actual_damage = target.take_damage(dmg)
                     
-                    print(f"You attack {target.name} for {actual_damage} damage!")
+                    self._p(f"You attack {target.name} for {actual_damage} damage!\n")
                     
                     if not target.is_alive:
-                        print(colored_text(f"{target.name} has been defeated!", "\033[92m"))
+                        self._mark_defeated(target)
+                        self._p(colored_text(f"{target.name} has been defeated!", "\033[92m") + "\n")
                 else:
-                    print(f"You missed {target.name}!")
+                    self._p(f"You missed {target.name}!\n")
                     
         except ValueError:
-            print("Invalid target!")
+            self._p("Invalid target!\n")
     
     def _player_ability(self):
         """Player use ability"""
         if not self.player.abilities:
-            print("You have no abilities!")
+            self._p("You have no abilities!\n")
             return
         
         # Show available abilities
-        print("\nAbilities:")
+        self._p("\nAbilities:\n")
         available_abilities = []
         for i, ability in enumerate(self.player.abilities, 1):
             can_use, reason = ability.can_use(self.player)
             status = "✓" if can_use else f"✗ ({reason})"
-            print(f"  [{i}] {ability.name} - {status}")
+            self._p(f"  [{i}] {ability.name} - {status}\n")
             if can_use:
                 available_abilities.append((i, ability))
         
         if not available_abilities:
-            print("No abilities available to use!")
+            self._p("No abilities available to use!\n")
             return
         
         try:
-            choice = int(input("\nSelect ability (0 to cancel): ").strip())
+            choice = int(self._input("\nSelect ability (0 to cancel): ").strip())
             if choice == 0:
                 return
             
@@ -259,58 +345,54 @@ class CombatEncounter:
             if selected:
                 # Select target if needed
                 target = None
-                if selected.target_type == TargetType.SINGLE_ENEMY:
-                    alive_enemies = [e for e in self.enemies if e.is_alive]
-                    print("\nSelect target:")
+                if selected.target_type is TargetType.SINGLE_ENEMY:
+                    alive_enemies = self._living
+                    self._p("\nSelect target:\n")
                     for i, enemy in enumerate(alive_enemies, 1):
-                        print(f"  [{i}] {enemy.name}")
+                        self._p(f"  [{i}] {enemy.name}\n")
                     try:
-                        target_idx = int(input("Target: ").strip()) - 1
+                        target_idx = int(self._input("Target: ").strip()) - 1
                         if 0 <= target_idx < len(alive_enemies):
                             target = alive_enemies[target_idx]
                     except ValueError:
-                        print("Invalid target!")
+                        self._p("Invalid target!\n")
                         return
                 
                 # Use ability
                 result = selected.use(self.player, target)
-                print(f"\n{result['message']}")
+                self._p(f"\n{result['message']}\n")
                 for msg in result.get('messages', []):
-                    print(f"  {msg}")
+                    self._p(f"  {msg}\n")
                 
                 # Check if target died
                 if target and not target.is_alive:
-                    print(colored_text(f"{target.name} has been defeated!", "\033[92m"))
+                    self._mark_defeated(target)
+                    self._p(colored_text(f"{target.name} has been defeated!", "\033[92m") + "\n")
                     
         except ValueError:
-            print("Invalid choice!")
+            self._p("Invalid choice!\n")
     
     def _player_item(self):
         """Player use item"""
-        # Get consumable items
-        from core.items import Consumable
-        consumables = [
-            item for item in self.player.inventory.items 
-            if isinstance(item, Consumable) and item.usable
-        ]
+        consumables = self.player.inventory.consumables
         
         if not consumables:
-            print("No usable items!")
+            self._p("No usable items!\n")
             return
         
-        print("\nItems:")
+        self._p("\nItems:\n")
         for i, item in enumerate(consumables, 1):
-            print(f"  [{i}] {item.name} x{item.quantity}")
+            self._p(f"  [{i}] {item.name} x{item.quantity}\n")
         
         try:
-            choice = int(input("\nSelect item (0 to cancel): ").strip())
+            choice = int(self._input("\nSelect item (0 to cancel): ").strip())
             if choice == 0:
                 return
             
             if 1 <= choice <= len(consumables):
                 item = consumables[choice - 1]
                 success, msg = item.use(self.player)
-                print(f"\n{msg}")
+                self._p(f"\n{msg}\n")
                 
                 # Remove or decrement item
                 if item.quantity <= 1:
@@ -319,11 +401,11 @@ class CombatEncounter:
                     item.quantity -= 1
                     
         except ValueError:
-            print("Invalid choice!")
+            self._p("Invalid choice!\n")
     
     def _player_defend(self):
         """Player defends"""
-        print("You take a defensive stance!")
+        self._p("You take a defensive stance!\n")
         self.player.apply_status_effect(StatusEffectType.DEFENSE_BUFF, 1, 5)
     
     def _player_flee(self) -> bool:
@@ -331,23 +413,34 @@ class CombatEncounter:
         flee_chance = 50 + (self.player.get_stat(StatType.DEXTERITY) - 10) * 2
         flee_chance = clamp(flee_chance, 10, 90)
         
-        if random.randint(1, 100) <= flee_chance:
-            print(colored_text("You successfully fled!", "\033[92m"))
+        if _random() * 100 < flee_chance:
+            self._p(_FLED_TAG)
             return True
         else:
-            print(colored_text("Failed to flee!", "\033[91m"))
+            self._p(_FLEE_FAILED_TAG)
             return False
     
     def _enemy_turn(self):
         """Process enemy turns"""
-        print(f"\n{'='*60}")
-        print("ENEMY TURN")
-        print(f"{'='*60}")
+        self._p(_ENEMY_TURN_HEADER)
+        
+        n = len(self._living)
+        
+        # Draw every roll for the turn up front: ability trigger, ability pick, hit, crit
+        rolls = [_random() for _ in range(4 * n)]
+        ability_rolls = rolls[0:n]
+        pick_rolls = rolls[n:2 * n]
+        
+        # Resolve all basic attacks in one pass; the loop below only applies them
+        hit_chance = clamp(80 - self.player.get_evasion(), 10, 95)
+        attacks = _resolve_enemy_attacks(
+            self._living_attack,
+            rolls[2 * n:3 * n],
+            rolls[3 * n:],
+            hit_chance
+        )
         
-        for enemy in self.enemies:
-            if not enemy.is_alive:
-                continue
-            
+        for k, enemy in enumerate(self._living):
             # Simple AI: attack player
             if enemy.abilities:
                 # Try to use ability if available
@@ -355,25 +448,19 @@ class CombatEncounter:
                     ability for ability in enemy.abilities 
                     if ability.can_use(enemy)[0]
                 ]
-                if usable_abilities and random.random() < 0.3:
-                    ability = random.choice(usable_abilities)
+                if usable_abilities and ability_rolls[k] < 0.3:
+                    ability = usable_abilities[int(pick_rolls[k] * len(usable_abilities))]
                     result = ability.use(enemy, self.player)
-                    print(f"\n{enemy.name} uses {ability.name}!")
+                    self._p(f"\n{enemy.name} uses {ability.name}!\n")
                     for msg in result.get('messages', []):
-                        print(f"  {msg}")
+                        self._p(f"  {msg}\n")
                     continue
             
             # Basic attack
-            hit_chance = 80 - self.player.get_evasion()
-            hit_chance = clamp(hit_chance, 10, 95)
-            
-            if random.randint(1, 100) <= hit_chance:
-                damage = enemy.get_attack_power()
-                is_critical = random.random() < 0.05
-                
+            hit, is_critical, damage = attacks[k]
+            if hit:
                 if is_critical:
-                    damage = int(damage * 1.5)
-                    print(colored_text("Enemy critical hit!", "\033[91m"))
+                    self._p(_ENEMY_CRIT_TAG)
                 
                 dmg = Damage(
                     amount=damage,
@@ -382,78 +469,72 @@ class CombatEncounter:
                 )
                 actual_damage = self.player.take_damage(dmg)
                 
-                print(f"\n{enemy.name} attacks you for {actual_damage} damage!")
+                self._p(f"\n{enemy.name} attacks you for {actual_damage} damage!\n")
                 
                 if not self.player.is_alive:
-                    print(colored_text("You have been defeated!", "\033[91m"))
+                    self._p(_DEFEAT_TAG)
                     break
             else:
-                print(f"\n{enemy.name} missed!")
+                self._p(f"\n{enemy.name} missed!\n")
+        
+        self._flush()
     
     def _process_status_effects(self):
         """Process status effects for all combatants"""
         # Process player effects
-        messages = self.player.process_status_effects()
-        for msg in messages:
-            print(f"  {msg}")
+        if self.player.status_effects_active:
+            for msg in self.player.process_status_effects():
+                self._p(f"  {msg}\n")
         
         # Process enemy effects
         for enemy in self.enemies:
-            messages = enemy.process_status_effects()
-            for msg in messages:
-                print(f"  {msg}")
+            if enemy.status_effects_active:
+                for msg in enemy.process_status_effects():
+                    self._p(f"  {msg}\n")
+                if not enemy.is_alive:
+                    self._mark_defeated(enemy)
     
     def _calculate_experience(self) -> int:
         """Calculate experience gained"""
-        total_exp = 0
-        for enemy in self.enemies:
-            if not enemy.is_alive:
-                base_exp = enemy.level * 10
-                total_exp += base_exp
-        return total_exp
+        return self._defeated_level_sum * 10
     
     def _calculate_gold(self) -> int:
         """Calculate gold gained"""
-        total_gold = 0
-        for enemy in self.enemies:
-            if not enemy.is_alive:
-                base_gold = enemy.level * 5
-                total_gold += base_gold
-        return total_gold
+        return self._defeated_level_sum * 5
     
     def _generate_loot(self) -> List[Any]:
         """Generate loot from defeated enemies"""
-        from core.items import get_random_item, Rarity, ItemType
+        from core.items import get_random_item, Rarity
+        
+        rolls = [_random() for _ in range(2 * len(self.enemies))]
+        
+        # Higher level enemies have better drop rates (30% base chance)
+        drops = [
+            i for i, enemy in enumerate(self.enemies)
+            if not enemy.is_alive
+            and rolls[2 * i] < (0.7 if enemy.level >= 20 else 0.5 if enemy.level >= 10 else 0.3)
+        ]
         
         loot = []
-        for enemy in self.enemies:
-            if not enemy.is_alive:
-                # Chance for item drop based on enemy rarity
-                drop_chance = 0.3  # 30% base chance
-                
-                # Higher level enemies have better drop rates
-                if enemy.level >= 10:
-                    drop_chance = 0.5
-                if enemy.level >= 20:
-                    drop_chance = 0.7
-                
-                if random.random() < drop_chance:
-                    # Determine rarity based on enemy level
-                    rarity_roll = random.random()
-                    if enemy.level >= 20 and rarity_roll < 0.1:
-                        rarity = Rarity.LEGENDARY
-                    elif enemy.level >= 15 and rarity_roll < 0.2:
-                        rarity = Rarity.EPIC
-                    elif enemy.level >= 10 and rarity_roll < 0.3:
-                        rarity = Rarity.RARE
-                    elif enemy.level >= 5 and rarity_roll < 0.5:
-                        rarity = Rarity.UNCOMMON
-                    else:
-                        rarity = Rarity.COMMON
-                    
-                    item = get_random_item(rarity=rarity)
-                    if item:
-                        loot.append(item)
+        for i in drops:
+            enemy = self.enemies[i]
+            
+            # Determine rarity based on enemy level
+            rarity_roll = rolls[2 * i + 1]
+            if enemy.level >= 20 and rarity_roll < 0.1:
+                rarity = Rarity.LEGENDARY
+            elif enemy.level >= 15 and rarity_roll < 0.2:
+                rarity = Rarity.EPIC
+            elif enemy.level >= 10 and rarity_roll < 0.3:
+                rarity = Rarity.RARE
+            elif enemy.level >= 5 and rarity_roll < 0.5:
+                rarity = Rarity.UNCOMMON
+            else:
+                rarity = Rarity.COMMON
+            
+            item = get_random_item(rarity=rarity)
+            if item:
+                loot.append(item)
         
         return loot
 
@@ -462,155 +543,228 @@ class CombatEncounter:
 # ENEMY FACTORY
 # =============================================================================
 
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class EnemyTemplate:
+    """Immutable base stats for an enemy type"""
+    name: str
+    description: str
+    base_hp: int
+    base_mp: int
+    base_damage: int
+    rarity: str
+    faction: str
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EnemyTemplate':
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            base_hp=data["base_hp"],
+            base_mp=data.get("base_mp", 0),
+            base_damage=data.get("base_damage", 0),
+            rarity=data.get("rarity", "Common"),
+            faction=data.get("faction", "monster")
+        )
+
+
+_RESISTANT_RARITIES = frozenset({"Epic", "Legendary"})
+_ABILITY_RARITIES = frozenset({"Uncommon", "Rare", "Epic", "Legendary"})
+
+
 class EnemyFactory:
     """Factory for creating enemies"""
     
-    ENEMY_TEMPLATES = {
-        "goblin": {
-            "name": "Goblin",
-            "description": "A small, green-skinned creature.",
-            "base_hp": 30,
-            "base_mp": 10,
-            "base_damage": 5,
-            "rarity": "Common",
-            "faction": "goblin"
-        },
-        "wolf": {
-            "name": "Wolf",
-            "description": "A wild, hungry wolf.",
-            "base_hp": 40,
-            "base_mp": 0,
-            "base_damage": 8,
-            "rarity": "Common",
-            "faction": "beast"
-        },
-        "skeleton": {
-            "name": "Skeleton",
-            "description": "An undead skeleton warrior.",
-            "base_hp": 35,
-            "base_mp": 0,
-            "base_damage": 6,
-            "rarity": "Common",
-            "faction": "undead"
-        },
-        "orc_warrior": {
-            "name": "Orc Warrior",
-            "description": "A strong orc fighter.",
-            "base_hp": 60,
-            "base_mp": 20,
-            "base_damage": 12,
-            "rarity": "Uncommon",
-            "faction": "orc"
-        },
-        "dark_mage": {
-            "name": "Dark Mage",
-            "description": "A practitioner of dark magic.",
-            "base_hp": 45,
-            "base_mp": 80,
-            "base_damage": 15,
-            "rarity": "Uncommon",
-            "faction": "cultist"
-        },
-        "troll": {
-            "name": "Troll",
-            "description": "A large, regenerating troll.",
-            "base_hp": 100,
-            "base_mp": 30,
-            "base_damage": 18,
-            "rarity": "Rare",
-            "faction": "troll"
-        },
-        "dragon_wyrmling": {
-            "name": "Dragon Wyrmling",
-            "description": "A young dragon.",
-            "base_hp": 150,
-            "base_mp": 100,
-            "base_damage": 25,
-            "rarity": "Rare",
-            "faction": "dragon"
-        },
-        "vampire": {
-            "name": "Vampire",
-            "description": "A powerful vampire lord.",
-            "base_hp": 200,
-            "base_mp": 150,
-            "base_damage": 30,
-            "rarity": "Epic",
-            "faction": "vampire"
-        },
-        "demon": {
-            "name": "Demon",
-            "description": "A creature from the abyss.",
-            "base_hp": 250,
-            "base_mp": 200,
-            "base_damage": 40,
-            "rarity": "Epic",
-            "faction": "demon"
-        },
-        "ancient_dragon": {
-            "name": "Ancient Dragon",
-            "description": "A mighty dragon of legend.",
-            "base_hp": 1000,
-            "base_mp": 500,
-            "base_damage": 100,
-            "rarity": "Legendary",
-            "faction": "dragon"
-        }
+    ENEMY_TEMPLATES: Dict[str, EnemyTemplate] = {
+        "goblin": EnemyTemplate(
+            name="Goblin",
+            description="A small, green-skinned creature.",
+            base_hp=30,
+            base_mp=10,
+            base_damage=5,
+            rarity="Common",
+            faction="goblin"
+        ),
+        "wolf": EnemyTemplate(
+            name="Wolf",
+            description="A wild, hungry wolf.",
+            base_hp=40,
+            base_mp=0,
+            base_damage=8,
+            rarity="Common",
+            faction="beast"
+        ),
+        "skeleton": EnemyTemplate(
+            name="Skeleton",
+            description="An undead skeleton warrior.",
+            base_hp=35,
+            base_mp=0,
+            base_damage=6,
+            rarity="Common",
+            faction="undead"
+        ),
+        "orc_warrior": EnemyTemplate(
+            name="Orc Warrior",
+            description="A strong orc fighter.",
+            base_hp=60,
+            base_mp=20,
+            base_damage=12,
+            rarity="Uncommon",
+            faction="orc"
+        ),
+        "dark_mage": EnemyTemplate(
+            name="Dark Mage",
+            description="A practitioner of dark magic.",
+            base_hp=45,
+            base_mp=80,
+            base_damage=15,
+            rarity="Uncommon",
+            faction="cultist"
+        ),
+        "troll": EnemyTemplate(
+            name="Troll",
+            description="A large, regenerating troll.",
+            base_hp=100,
+            base_mp=30,
+            base_damage=18,
+            rarity="Rare",
+            faction="troll"
+        ),
+        "dragon_wyrmling": EnemyTemplate(
+            name="Dragon Wyrmling",
+            description="A young dragon.",
+            base_hp=150,
+            base_mp=100,
+            base_damage=25,
+            rarity="Rare",
+            faction="dragon"
+        ),
+        "vampire": EnemyTemplate(
+            name="Vampire",
+            description="A powerful vampire lord.",
+            base_hp=200,
+            base_mp=150,
+            base_damage=30,
+            rarity="Epic",
+            faction="vampire"
+        ),
+        "demon": EnemyTemplate(
+            name="Demon",
+            description="A creature from the abyss.",
+            base_hp=250,
+            base_mp=200,
+            base_damage=40,
+            rarity="Epic",
+            faction="demon"
+        ),
+        "ancient_dragon": EnemyTemplate(
+            name="Ancient Dragon",
+            description="A mighty dragon of legend.",
+            base_hp=1000,
+            base_mp=500,
+            base_damage=100,
+            rarity="Legendary",
+            faction="dragon"
+        )
     }
     
     @staticmethod
     def create_enemy(template_id: str, level: int = 1) -> Optional[Entity]:
         """Create an enemy from a template"""
-        if template_id not in EnemyFactory.ENEMY_TEMPLATES:
-            return None
-        
-        template = EnemyFactory.ENEMY_TEMPLATES[template_id]
-        
-        enemy = Entity(
-            name=template["name"],
-            level=level,
-            description=template["description"]
-        )
-        
-        # Scale stats based on level
-        level_mult = 1 + (level - 1) * 0.2
-        enemy.max_hp = int(template["base_hp"] * level_mult)
-        enemy.current_hp = enemy.max_hp
-        enemy.max_mp = int(template["base_mp"] * level_mult)
-        enemy.current_mp = enemy.max_mp
-        
-        enemy.faction = template.get("faction", "monster")
-        enemy.resistances[DamageType.PHYSICAL] = 0.1 if template["rarity"] in ["Epic", "Legendary"] else 0
-        
-        # Add abilities for higher level enemies
-        if level >= 5 and template["rarity"] in ["Uncommon", "Rare", "Epic", "Legendary"]:
-            enemy.abilities.append(Ability(
-                name="Power Strike",
-                description="A powerful attack.",
-                ability_type=AbilityType.ACTIVE,
-                target_type=TargetType.SINGLE_ENEMY,
-                mp_cost=10,
-                cooldown=2,
-                damage=int(template["base_damage"] * 1.5)
-            ))
-        
-        return enemy
+        ctor = _ENEMY_CTORS.get(template_id)
+        if ctor is None:
+            template = EnemyFactory.ENEMY_TEMPLATES.get(template_id)
+            if template is None:
+                return None
+            if isinstance(template, dict):
+                template = EnemyFactory.ENEMY_TEMPLATES[template_id] = EnemyTemplate.from_dict(template)
+            # Template registered after import - specialize it now
+            ctor = _ENEMY_CTORS[template_id] = _compile_enemy_ctor(template_id, template)
+        return ctor(level)
     
     @staticmethod
     def get_random_enemy(min_level: int = 1, max_level: int = 10, difficulty: str = "normal") -> Entity:
         """Get a random enemy appropriate for the level range"""
-        templates_by_difficulty = {
-            "easy": ["goblin", "wolf", "skeleton"],
-            "normal": ["goblin", "wolf", "skeleton", "orc_warrior", "dark_mage"],
-            "hard": ["orc_warrior", "dark_mage", "troll", "dragon_wyrmling"],
-            "boss": ["vampire", "demon", "ancient_dragon"]
-        }
-        
-        candidates = templates_by_difficulty.get(difficulty, templates_by_difficulty["normal"])
-        template_id = random.choice(candidates)
+        candidates = _TEMPLATES_BY_DIFFICULTY.get(difficulty, _TEMPLATES_BY_DIFFICULTY["normal"])
+        template_id = candidates[int(_random() * len(candidates))]
         level = random.randint(min_level, max_level)
         
         return EnemyFactory.create_enemy(template_id, level)
 
 
+_TEMPLATES_BY_DIFFICULTY: Dict[str, Tuple[str, ...]] = {
+    "easy": ("goblin", "wolf", "skeleton"),
+    "normal": ("goblin", "wolf", "skeleton", "orc_warrior", "dark_mage"),
+    "hard": ("orc_warrior", "dark_mage", "troll", "dragon_wyrmling"),
+    "boss": ("vampire", "demon", "ancient_dragon")
+}
+
+
+@lru_cache(maxsize=None)
+def _scaled_stats(template_id: str, level: int) -> Tuple[int, int]:
+    """Level-scaled (max_hp, max_mp) for a template"""
+    template = EnemyFactory.ENEMY_TEMPLATES[template_id]
+    level_mult = 1 + (level - 1) * 0.2
+    return int(template.base_hp * level_mult), int(template.base_mp * level_mult)
+
+
+# =============================================================================
+# SPECIALIZED ENEMY CONSTRUCTORS
+# =============================================================================
+
+_ENEMY_CTOR_SOURCE = """
+def _ctor_{tid}(level):
+    enemy = Entity(name={name!r}, level=level, description={description!r})
+    enemy.max_hp, enemy.max_mp = _scaled_stats({template_id!r}, level)
+    enemy.current_hp = enemy.max_hp
+    enemy.current_mp = enemy.max_mp
+    enemy.faction = {faction!r}
+    enemy.resistances[DamageType.PHYSICAL] = {resistance!r}
+{abilities}    return enemy
+"""
+
+_POWER_STRIKE_SOURCE = """    if level >= 5:
+        enemy.abilities.append(Ability(
+            name="Power Strike",
+            description="A powerful attack.",
+            ability_type=AbilityType.ACTIVE,
+            target_type=TargetType.SINGLE_ENEMY,
+            mp_cost=10,
+            cooldown=2,
+            damage={damage!r}
+        ))
+"""
+
+
+def _compile_enemy_ctor(template_id: str, template: EnemyTemplate) -> Callable[[int], Entity]:
+    """Generate a constructor with the template's constants inlined"""
+    rarity = template.rarity
+    namespace = {
+        "Entity": Entity, "DamageType": DamageType, "Ability": Ability,
+        "AbilityType": AbilityType, "TargetType": TargetType, "_scaled_stats": _scaled_stats
+    }
+    abilities = ""
+    if rarity in _ABILITY_RARITIES:
+        # Each spawn builds its own Ability so effects/requirements are never shared
+        abilities = _POWER_STRIKE_SOURCE.format(damage=int(template.base_damage * 1.5))
+    
+    tid = "".join(c if c.isalnum() else "_" for c in template_id)
+    source = _ENEMY_CTOR_SOURCE.format(
+        tid=tid,
+        template_id=template_id,
+        name=template.name,
+        description=template.description,
+        faction=template.faction,
+        resistance=0.1 if rarity in _RESISTANT_RARITIES else 0,
+        abilities=abilities
+    )
+    exec(compile(source, f"<enemy:{template_id}>", "exec"), namespace)
+    return namespace[f"_ctor_{tid}"]
+
+
+_ENEMY_CTORS: Dict[str, Callable[[int], Entity]] = {
+    template_id: _compile_enemy_ctor(template_id, template)
+    for template_id, template in EnemyFactory.ENEMY_TEMPLATES.items()
+}
+
+
 print("Combat system loaded successfully!")
@@ -7,20 +7,45 @@ Version: 1.0.0
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
+from typing import Dict, FrozenSet, List, Set, Tuple, Optional, TYPE_CHECKING
 from enum import Enum
-import sys
-import os
+import logging
 import random
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.engine import DATACLASS_SLOTS
 from core.items import Item, get_item
 
 if TYPE_CHECKING:
     from core.character import Character
 
+logger = logging.getLogger(__name__)
 
-class CraftingCategory(Enum):
+
+# Bound once so batch rolls skip the module attribute lookup
+_random = random.random
+
+# Largest stack held per item id, and lower-cased names of every item held
+OwnedIndex = Tuple[Dict[str, int], Set[str]]
+
+
+def build_owned_index(player: 'Character') -> OwnedIndex:
+    """Index the player's inventory for recipe checks"""
+    owned: Dict[str, int] = {}
+    names: Set[str] = set()
+    for item in player.inventory.items:
+        names.add(item.name.lower())
+        item_id = item.item_id
+        if item.quantity > owned.get(item_id, 0):
+            owned[item_id] = item.quantity
+    return owned, names
+
+
+def _batch_rolls(n: int, success_chance: float) -> List[bool]:
+    """Roll n crafting attempts against the same success chance"""
+    return [_random() <= success_chance for _ in range(n)]
+
+
+class CraftingCategory(str, Enum):
     BLACKSMITH = "blacksmith"
     ALCHEMY = "alchemy"
     ENCHANTING = "enchanting"
@@ -30,7 +55,11 @@ class CraftingCategory(Enum):
     TAILORING = "tailoring"
 
 
-@dataclass
+_CATEGORY_LABEL: Dict[CraftingCategory, str] = {c: f"\n{c.value.title()}:" for c in CraftingCategory}
+_MENU_HEADER = f"\n{'='*60}\nCRAFTING\n{'='*60}"
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CraftingRecipe:
     """A crafting recipe"""
     id: str
@@ -46,45 +75,53 @@ class CraftingRecipe:
     quality_range: Tuple[int, int] = (1, 3)
     experience_gained: int = 10
     description: str = ""
+    _materials_display: str = field(default="", init=False, repr=False, compare=False)
+    _tool_names: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
     
-    def can_craft(self, player: 'Character') -> Tuple[bool, str]:
+    def __post_init__(self):
+        # Materials never change after construction, so render them once
+        object.__setattr__(self, "_materials_display", "\n".join(
+            f"  • {material_id.replace('_', ' ').title()}: {quantity}"
+            for material_id, quantity in self.materials.items()
+        ))
+        object.__setattr__(self, "_tool_names", frozenset(tool.lower() for tool in self.tools_required))
+    
+    def can_craft(self, player: 'Character', owned_index: Optional[OwnedIndex] = None) -> Tuple[bool, str]:
         """Check if player can craft this recipe"""
         # Check skill level
         skill = player.skills.get(self.skill_required)
         if not skill or skill.current_level < self.skill_level:
             return False, f"Requires {self.skill_required} level {self.skill_level}"
         
+        missing = self._missing_requirement(
+            owned_index if owned_index is not None else build_owned_index(player)
+        )
+        if missing:
+            return False, missing
+        
+        return True, "Can craft"
+    
+    def _missing_requirement(self, owned_index: OwnedIndex) -> Optional[str]:
+        """Get the first missing material or tool, or None if all are held"""
+        owned, names = owned_index
+        
         # Check materials - use item IDs instead of display names
         for material_id, quantity in self.materials.items():
-            # Try to find item by ID first, then by name
-            has_item = False
-            for item in player.inventory.items:
-                item_id = item.name.lower().replace(" ", "_")
-                if item_id == material_id and item.quantity >= quantity:
-                    has_item = True
-                    break
-            
-            if not has_item:
-                return False, f"Missing materials: {material_id.replace('_', ' ').title()}"
+            if owned.get(material_id, 0) < quantity:
+                return f"Missing materials: {material_id.replace('_', ' ').title()}"
         
         # Check tools
-        for tool in self.tools_required:
-            has_tool = False
-            for item in player.inventory.items:
-                if item.name.lower() == tool.lower():
-                    has_tool = True
-                    break
-            if not has_tool:
-                return False, f"Missing tool: {tool}"
+        if self._tool_names:
+            missing = self._tool_names - names
+            if missing:
+                tool = next(t for t in self.tools_required if t.lower() in missing)
+                return f"Missing tool: {tool}"
         
-        return True, "Can craft"
+        return None
     
     def get_materials_display(self) -> str:
         """Get materials needed display"""
-        lines = []
-        for material_id, quantity in self.materials.items():
-            lines.append(f"  • {material_id.replace('_', ' ').title()}: {quantity}")
-        return "\n".join(lines)
+        return self._materials_display
     
     def to_dict(self) -> Dict:
         return {
@@ -122,139 +159,217 @@ class CraftingRecipe:
         )
 
 
+# Built once at import; recipes are shared by every manager
+_DEFAULT_RECIPES: Dict[str, CraftingRecipe] = {
+    # Blacksmithing
+    "iron_sword": CraftingRecipe(
+        id="iron_sword",
+        name="Iron Sword",
+        category=CraftingCategory.BLACKSMITH,
+        result_item="iron_sword",
+        materials={"iron_ore": 3, "leather": 1},
+        skill_required="Crafting",
+        skill_level=2,
+        success_rate=0.85,
+        experience_gained=25,
+        description="Forge a basic iron sword."
+    ),
+    "steel_sword": CraftingRecipe(
+        id="steel_sword",
+        name="Steel Sword",
+        category=CraftingCategory.BLACKSMITH,
+        result_item="steel_sword",
+        materials={"iron_ore": 5, "magic_essence": 1},
+        skill_required="Crafting",
+        skill_level=5,
+        success_rate=0.75,
+        experience_gained=50,
+        description="Forge a quality steel sword."
+    ),
+    "iron_armor": CraftingRecipe(
+        id="iron_armor",
+        name="Iron Armor",
+        category=CraftingCategory.BLACKSMITH,
+        result_item="iron_armor",
+        materials={"iron_ore": 8, "leather": 2},
+        skill_required="Crafting",
+        skill_level=3,
+        success_rate=0.80,
+        experience_gained=40,
+        description="Forge protective iron armor."
+    ),
+    
+    # Alchemy
+    "health_potion": CraftingRecipe(
+        id="health_potion",
+        name="Health Potion",
+        category=CraftingCategory.ALCHEMY,
+        result_item="health_potion",
+        materials={"herb": 2},
+        skill_required="Magic",
+        skill_level=1,
+        success_rate=0.90,
+        experience_gained=15,
+        description="Brew a healing potion."
+    ),
+    "mana_potion": CraftingRecipe(
+        id="mana_potion",
+        name="Mana Potion",
+        category=CraftingCategory.ALCHEMY,
+        result_item="mana_potion",
+        materials={"herb": 1, "magic_essence": 1},
+        skill_required="Magic",
+        skill_level=3,
+        success_rate=0.85,
+        experience_gained=20,
+        description="Brew a mana restoration potion."
+    ),
+    "elixir": CraftingRecipe(
+        id="elixir",
+        name="Elixir",
+        category=CraftingCategory.ALCHEMY,
+        result_item="elixir",
+        materials={"health_potion": 1, "mana_potion": 1, "magic_essence": 2},
+        skill_required="Magic",
+        skill_level=5,
+        success_rate=0.70,
+        experience_gained=50,
+        description="Brew a powerful elixir."
+    ),
+    
+    # Enchanting
+    "enchanted_ring": CraftingRecipe(
+        id="enchanted_ring",
+        name="Enchanted Ring",
+        category=CraftingCategory.ENCHANTING,
+        result_item="silver_ring",
+        materials={"silver_ring": 1, "magic_essence": 2},
+        skill_required="Magic",
+        skill_level=4,
+        success_rate=0.75,
+        experience_gained=35,
+        description="Enchant a ring with magical properties."
+    ),
+    
+    # Cooking
+    "traveler_meal": CraftingRecipe(
+        id="traveler_meal",
+        name="Traveler's Meal",
+        category=CraftingCategory.COOKING,
+        result_item="traveler_meal",
+        materials={"herb": 1},
+        skill_required="Survival",
+        skill_level=1,
+        success_rate=0.95,
+        experience_gained=10,
+        description="Prepare a simple but nourishing meal."
+    )
+}
+
+
+# Below this many recipes a linear prefix scan beats building the trie
+_TRIE_MIN_RECIPES = 32
+
+
+def skill_levels(player: 'Character') -> Dict[str, int]:
+    """Snapshot the player's skill levels by skill name"""
+    return {name: skill.current_level for name, skill in player.skills.items()}
+
+
+class RecipeTrie:
+    """Prefix index over recipe IDs and lower-cased names"""
+    
+    def __init__(self):
+        # Each node is (children, IDs of recipes with a key through this node)
+        self._root: Tuple[Dict[str, tuple], List[str]] = ({}, [])
+    
+    def insert(self, key: str, recipe_id: str):
+        """Index a recipe under a lookup key"""
+        node = self._root
+        self._add_id(node, recipe_id)
+        for ch in key:
+            node = node[0].setdefault(ch, ({}, []))
+            self._add_id(node, recipe_id)
+    
+    @staticmethod
+    def _add_id(node: tuple, recipe_id: str):
+        ids = node[1]
+        # A recipe's ID and name often share a prefix; keep it listed once
+        if not ids or ids[-1] != recipe_id:
+            ids.append(recipe_id)
+    
+    def find(self, prefix: str) -> List[str]:
+        """Get IDs of recipes with a key starting with prefix"""
+        node = self._root
+        for ch in prefix:
+            node = node[0].get(ch)
+            if node is None:
+                return []
+        return list(node[1])
+
+
 class CraftingManager:
     """Manages crafting recipes and operations"""
     
     def __init__(self):
         self.recipes: Dict[str, CraftingRecipe] = {}
+        self._by_category: Dict[CraftingCategory, List[CraftingRecipe]] = {}
+        self._by_skill: Dict[str, List[CraftingRecipe]] = {}
+        self._trie: Optional[RecipeTrie] = None
         self._init_recipes()
     
     def _init_recipes(self):
         """Initialize default recipes"""
-        default_recipes = {
-            # Blacksmithing
-            "iron_sword": CraftingRecipe(
-                id="iron_sword",
-                name="Iron Sword",
-                category=CraftingCategory.BLACKSMITH,
-                result_item="iron_sword",
-                materials={"iron_ore": 3, "leather": 1},
-                skill_required="Crafting",
-                skill_level=2,
-                success_rate=0.85,
-                experience_gained=25,
-                description="Forge a basic iron sword."
-            ),
-            "steel_sword": CraftingRecipe(
-                id="steel_sword",
-                name="Steel Sword",
-                category=CraftingCategory.BLACKSMITH,
-                result_item="steel_sword",
-                materials={"iron_ore": 5, "magic_essence": 1},
-                skill_required="Crafting",
-                skill_level=5,
-                success_rate=0.75,
-                experience_gained=50,
-                description="Forge a quality steel sword."
-            ),
-            "iron_armor": CraftingRecipe(
-                id="iron_armor",
-                name="Iron Armor",
-                category=CraftingCategory.BLACKSMITH,
-                result_item="iron_armor",
-                materials={"iron_ore": 8, "leather": 2},
-                skill_required="Crafting",
-                skill_level=3,
-                success_rate=0.80,
-                experience_gained=40,
-                description="Forge protective iron armor."
-            ),
-            
-            # Alchemy
-            "health_potion": CraftingRecipe(
-                id="health_potion",
-                name="Health Potion",
-                category=CraftingCategory.ALCHEMY,
-                result_item="health_potion",
-                materials={"herb": 2},
-                skill_required="Magic",
-                skill_level=1,
-                success_rate=0.90,
-                experience_gained=15,
-                description="Brew a healing potion."
-            ),
-            "mana_potion": CraftingRecipe(
-                id="mana_potion",
-                name="Mana Potion",
-                category=CraftingCategory.ALCHEMY,
-                result_item="mana_potion",
-                materials={"herb": 1, "magic_essence": 1},
-                skill_required="Magic",
-                skill_level=3,
-                success_rate=0.85,
-                experience_gained=20,
-                description="Brew a mana restoration potion."
-            ),
-            "elixir": CraftingRecipe(
-                id="elixir",
-                name="Elixir",
-                category=CraftingCategory.ALCHEMY,
-                result_item="elixir",
-                materials={"health_potion": 1, "mana_potion": 1, "magic_essence": 2},
-                skill_required="Magic",
-                skill_level=5,
-                success_rate=0.70,
-                experience_gained=50,
-                description="Brew a powerful elixir."
-            ),
-            
-            # Enchanting
-            "enchanted_ring": CraftingRecipe(
-                id="enchanted_ring",
-                name="Enchanted Ring",
-                category=CraftingCategory.ENCHANTING,
-                result_item="silver_ring",
-                materials={"silver_ring": 1, "magic_essence": 2},
-                skill_required="Magic",
-                skill_level=4,
-                success_rate=0.75,
-                experience_gained=35,
-                description="Enchant a ring with magical properties."
-            ),
-            
-            # Cooking
-            "traveler_meal": CraftingRecipe(
-                id="traveler_meal",
-                name="Traveler's Meal",
-                category=CraftingCategory.COOKING,
-                result_item="traveler_meal",
-                materials={"herb": 1},
-                skill_required="Survival",
-                skill_level=1,
-                success_rate=0.95,
-                experience_gained=10,
-                description="Prepare a simple but nourishing meal."
-            )
-        }
-        
-        for recipe_id, recipe in default_recipes.items():
-            self.recipes[recipe_id] = recipe
+        for recipe in _DEFAULT_RECIPES.values():
+            self.add_recipe(recipe)
+    
+    def add_recipe(self, recipe: CraftingRecipe):
+        """Register a recipe, replacing any recipe with the same ID"""
+        old = self.recipes.get(recipe.id)
+        if old is not None:
+            self._by_category[old.category].remove(old)
+            self._by_skill[old.skill_required].remove(old)
+        self.recipes[recipe.id] = recipe
+        self._by_category.setdefault(recipe.category, []).append(recipe)
+        self._by_skill.setdefault(recipe.skill_required, []).append(recipe)
+        self._trie = None
     
     def get_recipe(self, recipe_id: str) -> Optional[CraftingRecipe]:
         """Get a recipe by ID"""
         return self.recipes.get(recipe_id)
     
+    def find_recipes_by_prefix(self, prefix: str) -> List[CraftingRecipe]:
+        """Get recipes whose ID or name starts with prefix"""
+        prefix = prefix.lower()
+        if len(self.recipes) < _TRIE_MIN_RECIPES:
+            return [
+                r for r in self.recipes.values()
+                if r.id.startswith(prefix) or r.name.lower().startswith(prefix)
+            ]
+        
+        if self._trie is None:
+            self._trie = RecipeTrie()
+            for recipe in self.recipes.values():
+                self._trie.insert(recipe.id, recipe.id)
+                self._trie.insert(recipe.name.lower(), recipe.id)
+        return [self.recipes[recipe_id] for recipe_id in self._trie.find(prefix)]
+    
     def get_recipes_by_category(self, category: CraftingCategory) -> List[CraftingRecipe]:
         """Get all recipes in a category"""
-        return [r for r in self.recipes.values() if r.category == category]
+        return list(self._by_category.get(category, ()))
     
     def get_available_recipes(self, player: 'Character') -> List[CraftingRecipe]:
         """Get recipes the player can craft"""
         available = []
-        for recipe in self.recipes.values():
-            can_craft, _ = recipe.can_craft(player)
-            if can_craft:
-                available.append(recipe)
+        owned_index = build_owned_index(player)
+        levels = skill_levels(player)
+        for skill_name, recipes in self._by_skill.items():
+            level = levels.get(skill_name)
+            if level is None:
+                continue
+            for recipe in recipes:
+                if level >= recipe.skill_level and recipe._missing_requirement(owned_index) is None:
+                    available.append(recipe)
         return available
     
     def craft(self, recipe_id: str, player: 'Character') -> Tuple[bool, str, Optional[Item]]:
@@ -269,21 +384,9 @@ class CraftingManager:
             return False, message, None
         
         # Remove materials - use item IDs
-        for material_id, quantity in recipe.materials.items():
-            # Find item by ID
-            removed = False
-            for item in player.inventory.items:
-                item_id = item.name.lower().replace(" ", "_")
-                if item_id == material_id:
-                    if item.quantity <= quantity:
-                        player.inventory.items.remove(item)
-                    else:
-                        item.quantity -= quantity
-                    removed = True
-                    break
-            
-            if not removed:
-                return False, f"Failed to remove material: {material_id}", None
+        error = self._consume_materials(recipe, player)
+        if error:
+            return False, error, None
         
         # Determine success
         success_roll = random.random()
@@ -310,26 +413,81 @@ class CraftingManager:
                 skill.add_experience(recipe.experience_gained // 4)
             return False, "Crafting failed! Materials were lost.", None
     
+    def craft_batch(self, recipe_id: str, player: 'Character', count: int) -> Tuple[int, str, List[Item]]:
+        """Craft a recipe up to count times, stopping when materials run out"""
+        recipe = self.get_recipe(recipe_id)
+        if not recipe:
+            return 0, "Recipe not found.", []
+        
+        # Every attempt rolls against the skill level the batch started at
+        skill = player.skills.get(recipe.skill_required)
+        skill_bonus = (skill.current_level * 0.02) if skill else 0
+        rolls = _batch_rolls(count, recipe.success_rate + skill_bonus)
+        
+        crafted: List[Item] = []
+        attempts = 0
+        message = ""
+        for success in rolls:
+            can_craft, message = recipe.can_craft(player)
+            if not can_craft:
+                break
+            error = self._consume_materials(recipe, player)
+            if error:
+                message = error
+                break
+            attempts += 1
+            if success:
+                item = get_item(recipe.result_item, recipe.result_quantity)
+                if item:
+                    crafted.append(item)
+        
+        if attempts == 0:
+            return 0, message, []
+        
+        if skill:
+            failures = attempts - len(crafted)
+            skill.add_experience(
+                len(crafted) * recipe.experience_gained + failures * (recipe.experience_gained // 4)
+            )
+        player.items_crafted += len(crafted)
+        
+        summary = f"Crafted {recipe.name} {len(crafted)} of {attempts} time(s)."
+        if attempts < count:
+            summary += f" {message}"
+        return len(crafted), summary, crafted
+    
+    def _consume_materials(self, recipe: CraftingRecipe, player: 'Character') -> Optional[str]:
+        """Remove one craft's materials, returning an error message on failure"""
+        for material_id, quantity in recipe.materials.items():
+            # Find item by ID
+            for idx, item in enumerate(player.inventory.items):
+                if item.item_id == material_id:
+                    if item.quantity <= quantity:
+                        player.inventory.discard_at(idx)
+                    else:
+                        item.quantity -= quantity
+                    break
+            else:
+                return f"Failed to remove material: {material_id}"
+        return None
+    
     def get_crafting_menu(self, player: 'Character') -> str:
         """Get crafting menu display"""
-        lines = [
-            f"\n{'='*60}",
-            "CRAFTING",
-            f"{'='*60}"
-        ]
+        lines = [_MENU_HEADER]
+        owned_index = build_owned_index(player)
+        levels = skill_levels(player)
         
         for category in CraftingCategory:
-            recipes = self.get_recipes_by_category(category)
-            available = [
-                r for r in recipes
-                if player.skills.get(r.skill_required, None) and
-                player.skills[r.skill_required].current_level >= r.skill_level
-            ]
+            recipes = self._by_category.get(category)
+            if not recipes:
+                continue
+            available = [r for r in recipes if levels.get(r.skill_required, -1) >= r.skill_level]
             
             if available:
-                lines.append(f"\n{category.value.title()}:")
+                lines.append(_CATEGORY_LABEL[category])
                 for recipe in available:
-                    can_craft, _ = recipe.can_craft(player)
+                    # Skill level is already known to be met here
+                    can_craft = recipe._missing_requirement(owned_index) is None
                     status = "✓" if can_craft else "✗"
                     lines.append(f"  [{status}] {recipe.name} (Lv.{recipe.skill_level})")
         
@@ -341,4 +499,4 @@ class CraftingManager:
         }
 
 
-print("Crafting system loaded successfully!")
+logger.debug("Crafting system loaded successfully!")
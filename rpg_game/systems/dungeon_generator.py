@@ -9,12 +9,15 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional, Any, Set, TYPE_CHECKING
 from enum import Enum
+from types import MappingProxyType
+from itertools import accumulate
+import json
 import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.engine import Rarity, colored_text, clear_screen
+from core.engine import Rarity, colored_text, clear_screen, DATACLASS_SLOTS
 from systems.combat import EnemyFactory
 
 if TYPE_CHECKING:
@@ -48,7 +51,83 @@ class DungeonTheme(Enum):
     VOID = "void"
 
 
-@dataclass
+_ALL_THEMES: Tuple[DungeonTheme, ...] = tuple(DungeonTheme)
+
+# Reverse lookups for loading saves without going through Enum.__call__
+_RT_BY_VALUE: Dict[str, RoomType] = {rt.value: rt for rt in RoomType}
+_THEME_BY_VALUE: Dict[str, DungeonTheme] = {theme.value: theme for theme in DungeonTheme}
+
+
+_ROOM_SYMBOLS: Dict[RoomType, str] = {
+    RoomType.EMPTY: "·",
+    RoomType.COMBAT: "⚔",
+    RoomType.TREASURE: "💰",
+    RoomType.TRAP: "💀",
+    RoomType.REST: "🛏",
+    RoomType.BOSS: "👹",
+    RoomType.SHRINE: "⛩",
+    RoomType.PUZZLE: "❓",
+    RoomType.SHOP: "🏪",
+    RoomType.EXIT: "🚪"
+}
+
+
+_SEP50 = "=" * 50
+_EMPTY_ROW: MappingProxyType = MappingProxyType({})
+_LEGEND_LINES = (
+    "\nLegend: 🧙 You  ⚔ Combat  💰 Treasure  💀 Trap",
+    "        🛏 Rest  👹 Boss  ⛩ Shrine  🚪 Exit"
+)
+
+# Grid step for each movement direction
+_DIRS: Dict[str, Tuple[int, int]] = {
+    "north": (0, -1),
+    "south": (0, 1),
+    "east": (1, 0),
+    "west": (-1, 0)
+}
+
+
+def _pack(x: int, y: int) -> int:
+    """Pack room coordinates into a single int key"""
+    return ((x + 32768) << 16) | (y + 32768)
+
+
+def _unpack(key: int) -> Tuple[int, int]:
+    """Unpack an int room key into (x, y)"""
+    return (key >> 16) - 32768, (key & 0xFFFF) - 32768
+
+
+# Weights for non-boss room types, as cumulative totals
+_ROOM_WEIGHTS: Dict[RoomType, int] = {
+    RoomType.EMPTY: 30,
+    RoomType.COMBAT: 25,
+    RoomType.TREASURE: 15,
+    RoomType.TRAP: 10,
+    RoomType.REST: 5,
+    RoomType.SHRINE: 5,
+    RoomType.PUZZLE: 5,
+    RoomType.SHOP: 5
+}
+_ROOM_TYPES: Tuple[RoomType, ...] = tuple(_ROOM_WEIGHTS)
+_ROOM_CUM_WEIGHTS: Tuple[int, ...] = tuple(accumulate(_ROOM_WEIGHTS.values()))
+
+
+# Room loot by rarity with the chance of rolling that rarity; items within
+# a rarity are equally likely, so the table flattens to per-item weights
+_LOOT_TABLE: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "common": (0.5, ("health_potion", "gold", "iron_ore")),
+    "uncommon": (0.3, ("mana_potion", "magic_essence", "leather")),
+    "rare": (0.15, ("elixir", "enchanted_scroll", "rare_gem")),
+    "epic": (0.05, ("legendary_weapon", "epic_armor", "ancient_relic"))
+}
+_LOOT_ITEMS: Tuple[str, ...] = tuple(item for _, items in _LOOT_TABLE.values() for item in items)
+_LOOT_CUM_WEIGHTS: Tuple[float, ...] = tuple(accumulate(
+    chance / len(items) for chance, items in _LOOT_TABLE.values() for _ in items
+))
+
+
+@dataclass(**DATACLASS_SLOTS)
 class DungeonRoom:
     """A room in the dungeon"""
     x: int
@@ -56,7 +135,7 @@ class DungeonRoom:
     room_type: RoomType
     visited: bool = False
     cleared: bool = False
-    connections: List[Tuple[int, int]] = field(default_factory=list)
+    connections: Set[int] = field(default_factory=set)  # packed room keys
     enemies: List[str] = field(default_factory=list)
     loot: List[str] = field(default_factory=list)
     trap_difficulty: int = 0
@@ -67,66 +146,93 @@ class DungeonRoom:
         """Get symbol for map display"""
         if not self.visited:
             return "?"
-        symbols = {
-            RoomType.EMPTY: "·",
-            RoomType.COMBAT: "⚔",
-            RoomType.TREASURE: "💰",
-            RoomType.TRAP: "💀",
-            RoomType.REST: "🛏",
-            RoomType.BOSS: "👹",
-            RoomType.SHRINE: "⛩",
-            RoomType.PUZZLE: "❓",
-            RoomType.SHOP: "🏪",
-            RoomType.EXIT: "🚪"
-        }
-        return symbols.get(self.room_type, "?")
+        return _ROOM_SYMBOLS.get(self.room_type, "?")
     
     def to_dict(self) -> Dict:
-        return {
+        data = {
             "x": self.x,
             "y": self.y,
             "room_type": self.room_type.value,
             "visited": self.visited,
             "cleared": self.cleared,
-            "connections": self.connections,
-            "enemies": self.enemies,
-            "loot": self.loot,
             "trap_difficulty": self.trap_difficulty,
             "description": self.description,
             "special_event": self.special_event
         }
+        # Most rooms hold no enemies or loot; from_dict defaults missing lists
+        if self.connections:
+            data["connections"] = [_unpack(key) for key in sorted(self.connections)]
+        if self.enemies:
+            data["enemies"] = self.enemies
+        if self.loot:
+            data["loot"] = self.loot
+        return data
+    
+    def to_row(self) -> List[Any]:
+        """Get the room as a positional row for compact saves"""
+        return [
+            self.x, self.y, self.room_type.value, self.visited, self.cleared,
+            [_unpack(key) for key in sorted(self.connections)],
+            self.enemies, self.loot, self.trap_difficulty,
+            self.description, self.special_event
+        ]
+    
+    @classmethod
+    def from_row(cls, row: List[Any]) -> 'DungeonRoom':
+        (x, y, room_type, visited, cleared, connections,
+         enemies, loot, trap_difficulty, description, special_event) = row
+        return cls(
+            x=x,
+            y=y,
+            room_type=_RT_BY_VALUE[room_type],
+            visited=visited,
+            cleared=cleared,
+            connections={_pack(cx, cy) for cx, cy in connections},
+            enemies=enemies,
+            loot=loot,
+            trap_difficulty=trap_difficulty,
+            description=sys.intern(description),
+            special_event=special_event
+        )
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'DungeonRoom':
         return cls(
             x=data["x"],
             y=data["y"],
-            room_type=RoomType(data["room_type"]),
+            room_type=_RT_BY_VALUE[data["room_type"]],
             visited=data.get("visited", False),
             cleared=data.get("cleared", False),
-            connections=data.get("connections", []),
+            connections={_pack(x, y) for x, y in data.get("connections", [])},
             enemies=data.get("enemies", []),
             loot=data.get("loot", []),
             trap_difficulty=data.get("trap_difficulty", 0),
-            description=data.get("description", ""),
+            description=sys.intern(data.get("description", "")),
             special_event=data.get("special_event")
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DungeonFloor:
     """A floor in the dungeon"""
     floor_number: int
-    rooms: Dict[Tuple[int, int], DungeonRoom] = field(default_factory=dict)
+    rooms: Dict[int, DungeonRoom] = field(default_factory=dict)  # keyed by _pack(x, y)
     player_position: Tuple[int, int] = (0, 0)
     size: int = 5
     theme: DungeonTheme = DungeonTheme.CRYPT
     difficulty: int = 1
     cleared: bool = False
+    # (min_x, max_x, min_y, max_y) and the room count it was computed for
+    _bounds: Tuple[int, int, int, int] = field(default=(0, 0, 0, 0), init=False, repr=False, compare=False)
+    _bounds_rooms: int = field(default=0, init=False, repr=False, compare=False)
     
     def get_room(self, x: int, y: int) -> Optional[DungeonRoom]:
         """Get room at coordinates"""
-        return self.rooms.get((x, y))
+        return self.rooms.get(_pack(x, y))
+    
+    def add_room(self, room: DungeonRoom):
+        """Place a room at its coordinates"""
+        self.rooms[_pack(room.x, room.y)] = room
     
     def get_current_room(self) -> Optional[DungeonRoom]:
         """Get room at player position"""
@@ -134,77 +240,98 @@ class DungeonFloor:
     
     def move_player(self, direction: str) -> Tuple[bool, str]:
         """Move player in a direction"""
-        x, y = self.player_position
-        dx, dy = 0, 0
-        
-        if direction == "north":
-            dy = -1
-        elif direction == "south":
-            dy = 1
-        elif direction == "east":
-            dx = 1
-        elif direction == "west":
-            dx = -1
-        else:
+        step = _DIRS.get(direction)
+        if step is None:
             return False, "Invalid direction."
         
+        x, y = self.player_position
+        dx, dy = step
         new_x, new_y = x + dx, y + dy
+        new_key = _pack(new_x, new_y)
         
         # Check if room exists
-        if (new_x, new_y) not in self.rooms:
+        new_room = self.rooms.get(new_key)
+        if new_room is None:
             return False, "You cannot go that way."
         
         # Check if connected
         current_room = self.get_current_room()
-        if (new_x, new_y) not in current_room.connections:
+        if new_key not in current_room.connections:
             return False, "There is no path in that direction."
         
         self.player_position = (new_x, new_y)
-        new_room = self.get_current_room()
         new_room.visited = True
         
         return True, f"You move {direction}."
     
+    def get_bounds(self) -> Tuple[int, int, int, int]:
+        """Get (min_x, max_x, min_y, max_y) over all rooms"""
+        # Rooms are only ever added, so the count tells us when to rescan
+        if self._bounds_rooms != len(self.rooms):
+            it = iter(self.rooms)
+            min_x, min_y = _unpack(next(it))
+            max_x, max_y = min_x, min_y
+            for key in it:
+                x, y = _unpack(key)
+                if x < min_x:
+                    min_x = x
+                elif x > max_x:
+                    max_x = x
+                if y < min_y:
+                    min_y = y
+                elif y > max_y:
+                    max_y = y
+            self._bounds = (min_x, max_x, min_y, max_y)
+            self._bounds_rooms = len(self.rooms)
+        return self._bounds
+    
     def get_map_display(self) -> str:
         """Get visual map of floor"""
-        lines = [f"\n{'='*50}", f"Floor {self.floor_number} - {self.theme.value.title()}", f"{'='*50}"]
+        lines = [f"\n{_SEP50}", f"Floor {self.floor_number} - {self.theme.value.title()}", _SEP50]
         
         # Find bounds
-        min_x = min(x for x, y in self.rooms.keys())
-        max_x = max(x for x, y in self.rooms.keys())
-        min_y = min(y for x, y in self.rooms.keys())
-        max_y = max(y for x, y in self.rooms.keys())
+        min_x, max_x, min_y, max_y = self.get_bounds()
         
-        # Build map
+        # Build map, one row of rooms at a time
+        by_row: Dict[int, Dict[int, DungeonRoom]] = {}
+        for room in self.rooms.values():
+            by_row.setdefault(room.y, {})[room.x] = room
+        
+        player_x, player_y = self.player_position
         for y in range(min_y, max_y + 1):
-            row = ""
+            row = by_row.get(y, _EMPTY_ROW)
+            cells = []
+            append = cells.append
             for x in range(min_x, max_x + 1):
-                if (x, y) == self.player_position:
-                    row += "🧙"  # Player
-                elif (x, y) in self.rooms:
-                    room = self.rooms[(x, y)]
-                    row += room.get_display_symbol()
+                if x == player_x and y == player_y:
+                    append("🧙 ")  # Player
                 else:
-                    row += " "
-                row += " "
-            lines.append(row)
+                    room = row.get(x)
+                    append(room.get_display_symbol() + " " if room is not None else "  ")
+            lines.append("".join(cells))
         
         # Legend
-        lines.append("\nLegend: 🧙 You  ⚔ Combat  💰 Treasure  💀 Trap")
-        lines.append("        🛏 Rest  👹 Boss  ⛩ Shrine  🚪 Exit")
+        lines.extend(_LEGEND_LINES)
         
         return "\n".join(lines)
     
-    def to_dict(self) -> Dict:
-        return {
+    def to_dict(self, compact: bool = False) -> Dict:
+        data = {
             "floor_number": self.floor_number,
-            "rooms": {f"{x},{y}": room.to_dict() for (x, y), room in self.rooms.items()},
             "player_position": self.player_position,
             "size": self.size,
             "theme": self.theme.value,
             "difficulty": self.difficulty,
             "cleared": self.cleared
         }
+        if compact:
+            # One positional row per room instead of a keyed dict each
+            room_to_row = DungeonRoom.to_row
+            data["room_rows"] = [room_to_row(room) for room in self.rooms.values()]
+        else:
+            room_to_dict = DungeonRoom.to_dict
+            data["rooms"] = {f"{room.x},{room.y}": room_to_dict(room) for room in self.rooms.values()}
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'DungeonFloor':
@@ -212,7 +339,7 @@ class DungeonFloor:
             floor_number=data["floor_number"],
             player_position=tuple(data["player_position"]),
             size=data.get("size", 5),
-            theme=DungeonTheme(data.get("theme", "crypt")),
+            theme=_THEME_BY_VALUE[data.get("theme", "crypt")],
             difficulty=data.get("difficulty", 1),
             cleared=data.get("cleared", False)
         )
@@ -220,7 +347,9 @@ class DungeonFloor:
         # Restore rooms
         for key, room_data in data.get("rooms", {}).items():
             x, y = map(int, key.split(","))
-            floor.rooms[(x, y)] = DungeonRoom.from_dict(room_data)
+            floor.rooms[_pack(x, y)] = DungeonRoom.from_dict(room_data)
+        for row in data.get("room_rows", ()):
+            floor.add_room(DungeonRoom.from_row(row))
         
         return floor
 
@@ -271,10 +400,22 @@ class DungeonGenerator:
     }
     
     @staticmethod
-    def generate_floor(floor_number: int, player_level: int, theme: Optional[DungeonTheme] = None) -> DungeonFloor:
+    def generate_floors(num_floors: int, player_level: int, seed: Optional[int] = None) -> List[DungeonFloor]:
+        """Generate every floor of a dungeon sharing one theme and RNG"""
+        # Seeded runs get their own generator; otherwise use the global one
+        rng = random.Random(seed) if seed is not None else random
+        theme = rng.choice(_ALL_THEMES)
+        return [
+            DungeonGenerator.generate_floor(i, player_level, theme, rng)
+            for i in range(1, num_floors + 1)
+        ]
+    
+    @staticmethod
+    def generate_floor(floor_number: int, player_level: int, theme: Optional[DungeonTheme] = None,
+                       rng: Any = random) -> DungeonFloor:
         """Generate a random dungeon floor"""
         if theme is None:
-            theme = random.choice(list(DungeonTheme))
+            theme = rng.choice(_ALL_THEMES)
         
         # Calculate difficulty
         difficulty = floor_number + (player_level // 5)
@@ -291,7 +432,7 @@ class DungeonGenerator:
         
         # Generate rooms
         rooms_to_create = size * size // 2  # About half the grid
-        created_rooms: Set[Tuple[int, int]] = set()
+        created_rooms: Set[int] = set()
         
         # Start at center
         start_x, start_y = 0, 0
@@ -304,106 +445,104 @@ class DungeonGenerator:
             visited=True,
             description="The entrance to this floor."
         )
-        floor.rooms[(start_x, start_y)] = entrance
-        created_rooms.add((start_x, start_y))
+        floor.add_room(entrance)
+        created_rooms.add(_pack(start_x, start_y))
+        
+        # Furthest room from the entrance so far; it becomes the exit
+        exit_room = entrance
+        exit_distance = abs(start_x) + abs(start_y)
         
         # Generate connected rooms
         current_rooms = [(start_x, start_y)]
+        room_types = DungeonGenerator._draw_room_types(rooms_to_create, rng)
         
         for _ in range(rooms_to_create - 1):
-            if not current_rooms:
-                break
-            
             # Pick a random existing room to branch from
-            parent_x, parent_y = random.choice(current_rooms)
+            parent_x, parent_y = rng.choice(current_rooms)
             
             # Try to create a room in a random direction
             directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-            random.shuffle(directions)
+            rng.shuffle(directions)
             
             for dx, dy in directions:
                 new_x, new_y = parent_x + dx, parent_y + dy
+                new_key = _pack(new_x, new_y)
                 
                 # Check if spot is available
-                if (new_x, new_y) not in created_rooms and abs(new_x) <= size//2 and abs(new_y) <= size//2:
+                if new_key not in created_rooms and abs(new_x) <= size//2 and abs(new_y) <= size//2:
                     # Determine room type
-                    room_type = DungeonGenerator._determine_room_type(floor_number, len(created_rooms), rooms_to_create)
+                    room_type = DungeonGenerator._determine_room_type(
+                        floor_number, len(created_rooms), rooms_to_create, room_types[len(created_rooms)]
+                    )
                     
                     # Create room
                     room = DungeonRoom(
                         x=new_x, y=new_y,
                         room_type=room_type,
-                        description=DungeonGenerator._get_description(theme, room_type)
+                        description=DungeonGenerator._get_description(theme, room_type, rng)
                     )
                     
                     # Add content based on type
                     if room_type == RoomType.COMBAT:
-                        room.enemies = DungeonGenerator._generate_enemies(difficulty, theme)
+                        room.enemies = DungeonGenerator._generate_enemies(difficulty, theme, rng)
                     elif room_type == RoomType.TREASURE:
-                        room.loot = DungeonGenerator._generate_loot(difficulty)
+                        room.loot = DungeonGenerator._generate_loot(difficulty, rng)
                     elif room_type == RoomType.TRAP:
                         room.trap_difficulty = difficulty
                     elif room_type == RoomType.BOSS:
-                        room.enemies = DungeonGenerator._generate_boss(difficulty, theme)
-                        room.loot = DungeonGenerator._generate_loot(difficulty + 5)
+                        room.enemies = DungeonGenerator._generate_boss(difficulty, theme, rng)
+                        room.loot = DungeonGenerator._generate_loot(difficulty + 5, rng)
                     
                     # Connect rooms
-                    room.connections.append((parent_x, parent_y))
-                    parent_room = floor.rooms[(parent_x, parent_y)]
-                    parent_room.connections.append((new_x, new_y))
+                    parent_key = _pack(parent_x, parent_y)
+                    room.connections.add(parent_key)
+                    floor.rooms[parent_key].connections.add(new_key)
                     
-                    floor.rooms[(new_x, new_y)] = room
-                    created_rooms.add((new_x, new_y))
+                    floor.rooms[new_key] = room
+                    created_rooms.add(new_key)
                     current_rooms.append((new_x, new_y))
+                    distance = abs(new_x) + abs(new_y)
+                    if distance > exit_distance:
+                        exit_room, exit_distance = room, distance
                     break
         
         # Ensure there's an exit room (furthest room from entrance)
-        furthest_room = max(created_rooms, key=lambda pos: abs(pos[0]) + abs(pos[1]))
-        exit_room = floor.rooms[furthest_room]
         exit_room.room_type = RoomType.EXIT
         exit_room.description = "Stairs lead to the next floor."
         
         return floor
     
     @staticmethod
-    def _determine_room_type(floor_number: int, current_rooms: int, total_rooms: int) -> RoomType:
+    def _determine_room_type(floor_number: int, current_rooms: int, total_rooms: int, drawn: RoomType) -> RoomType:
         """Determine what type of room to create"""
         # Boss room on last room of every 5th floor
         if current_rooms == total_rooms - 1 and floor_number % 5 == 0:
             return RoomType.BOSS
         
-        # Weighted random selection
-        weights = {
-            RoomType.EMPTY: 30,
-            RoomType.COMBAT: 25,
-            RoomType.TREASURE: 15,
-            RoomType.TRAP: 10,
-            RoomType.REST: 5,
-            RoomType.SHRINE: 5,
-            RoomType.PUZZLE: 5,
-            RoomType.SHOP: 5
-        }
-        
-        return random.choices(list(weights.keys()), weights=list(weights.values()))[0]
+        # Weighted random selection, drawn up front for the whole floor
+        return drawn
     
     @staticmethod
-    def _get_description(theme: DungeonTheme, room_type: RoomType) -> str:
+    def _draw_room_types(count: int, rng: Any = random) -> List[RoomType]:
+        """Draw weighted room types for a whole floor in one call"""
+        return rng.choices(_ROOM_TYPES, cum_weights=_ROOM_CUM_WEIGHTS, k=count)
+    
+    @staticmethod
+    def _get_description(theme: DungeonTheme, room_type: RoomType, rng: Any = random) -> str:
         """Get a random description for room"""
-        theme_data = DungeonGenerator.THEMES.get(theme, DungeonGenerator.THEMES[DungeonTheme.CRYPT])
-        descriptions = theme_data["descriptions"].get(room_type, ["A mysterious room."])
-        return random.choice(descriptions)
+        return rng.choice(_DESC_TABLE[(theme, room_type)])
     
     @staticmethod
-    def _generate_enemies(difficulty: int, theme: DungeonTheme) -> List[str]:
+    def _generate_enemies(difficulty: int, theme: DungeonTheme, rng: Any = random) -> List[str]:
         """Generate enemy list for a room"""
         theme_data = DungeonGenerator.THEMES.get(theme, DungeonGenerator.THEMES[DungeonTheme.CRYPT])
         available_enemies = theme_data["enemies"]
         
-        num_enemies = min(random.randint(1, 3) + (difficulty // 5), 5)
-        return [random.choice(available_enemies) for _ in range(num_enemies)]
+        num_enemies = min(rng.randint(1, 3) + (difficulty // 5), 5)
+        return rng.choices(available_enemies, k=num_enemies)
     
     @staticmethod
-    def _generate_boss(difficulty: int, theme: DungeonTheme) -> List[str]:
+    def _generate_boss(difficulty: int, theme: DungeonTheme, rng: Any = random) -> List[str]:
         """Generate boss enemy"""
         bosses = {
             DungeonTheme.CRYPT: ["vampire", "lich"],
@@ -412,42 +551,50 @@ class DungeonGenerator:
         }
         
         available_bosses = bosses.get(theme, ["demon"])
-        return [random.choice(available_bosses)]
+        return [rng.choice(available_bosses)]
     
     @staticmethod
-    def _generate_loot(difficulty: int) -> List[str]:
+    def _generate_loot(difficulty: int, rng: Any = random) -> List[str]:
         """Generate loot for a room"""
-        loot_table = {
-            "common": ["health_potion", "gold", "iron_ore"],
-            "uncommon": ["mana_potion", "magic_essence", "leather"],
-            "rare": ["elixir", "enchanted_scroll", "rare_gem"],
-            "epic": ["legendary_weapon", "epic_armor", "ancient_relic"]
-        }
-        
-        loot = []
-        num_items = random.randint(1, 3)
-        
-        for _ in range(num_items):
-            roll = random.random()
-            if roll < 0.5:
-                rarity = "common"
-            elif roll < 0.8:
-                rarity = "uncommon"
-            elif roll < 0.95:
-                rarity = "rare"
-            else:
-                rarity = "epic"
-            
-            item = random.choice(loot_table[rarity])
-            loot.append(item)
-        
-        return loot
+        num_items = rng.randint(1, 3)
+        return rng.choices(_LOOT_ITEMS, cum_weights=_LOOT_CUM_WEIGHTS, k=num_items)
+
+
+def _freeze_theme(data: Dict[str, Any]) -> MappingProxyType:
+    """Make a theme's data read-only, interning its strings"""
+    return MappingProxyType({
+        "descriptions": MappingProxyType({
+            room_type: tuple(sys.intern(text) for text in texts)
+            for room_type, texts in data["descriptions"].items()
+        }),
+        "enemies": tuple(sys.intern(enemy) for enemy in data["enemies"]),
+        "traps": tuple(sys.intern(trap) for trap in data["traps"])
+    })
+
+
+# Theme data is shared by every dungeon, so freeze it once at import
+DungeonGenerator.THEMES = MappingProxyType({
+    theme: _freeze_theme(data) for theme, data in DungeonGenerator.THEMES.items()
+})
+
+
+# Room descriptions for every theme and room type, with the same fallbacks
+# as THEMES lookups: unthemed floors use crypt text, unknown rooms a default
+_DEFAULT_DESC: Tuple[str, ...] = ("A mysterious room.",)
+_DESC_TABLE: Dict[Tuple[DungeonTheme, RoomType], Tuple[str, ...]] = {
+    (theme, room_type): tuple(
+        DungeonGenerator.THEMES.get(theme, DungeonGenerator.THEMES[DungeonTheme.CRYPT])
+        ["descriptions"].get(room_type, _DEFAULT_DESC)
+    )
+    for theme in DungeonTheme
+    for room_type in RoomType
+}
 
 
 class RandomDungeon:
     """A complete random dungeon with multiple floors"""
     
-    def __init__(self, name: str, player_level: int, num_floors: int = 5):
+    def __init__(self, name: str, player_level: int, num_floors: int = 5, seed: Optional[int] = None):
         self.name = name
         self.player_level = player_level
         self.num_floors = num_floors
@@ -459,10 +606,7 @@ class RandomDungeon:
         self.bosses_defeated = 0
         
         # Generate floors
-        theme = random.choice(list(DungeonTheme))
-        for i in range(1, num_floors + 1):
-            floor = DungeonGenerator.generate_floor(i, player_level, theme)
-            self.floors.append(floor)
+        self.floors = DungeonGenerator.generate_floors(num_floors, player_level, seed)
     
     def get_current_floor(self) -> Optional[DungeonFloor]:
         """Get current floor"""
@@ -493,13 +637,14 @@ class RandomDungeon:
         ]
         return "\n".join(lines)
     
-    def to_dict(self) -> Dict:
+    def to_dict(self, compact: bool = False) -> Dict:
+        floor_to_dict = DungeonFloor.to_dict
         return {
             "name": self.name,
             "player_level": self.player_level,
             "num_floors": self.num_floors,
             "current_floor_index": self.current_floor_index,
-            "floors": [floor.to_dict() for floor in self.floors],
+            "floors": [floor_to_dict(floor, compact) for floor in self.floors],
             "completed": self.completed,
             "total_gold_earned": self.total_gold_earned,
             "total_exp_earned": self.total_exp_earned,
@@ -519,6 +664,14 @@ class RandomDungeon:
         dungeon.total_exp_earned = data.get("total_exp_earned", 0)
         dungeon.bosses_defeated = data.get("bosses_defeated", 0)
         return dungeon
+    
+    def to_json(self) -> str:
+        """Serialize the dungeon to compact JSON"""
+        return json.dumps(self.to_dict(compact=True), separators=(",", ":"), ensure_ascii=False)
+    
+    @classmethod
+    def from_json(cls, text: str) -> 'RandomDungeon':
+        return cls.from_dict(json.loads(text))
 
 
 print("Dungeon generator system loaded successfully!")
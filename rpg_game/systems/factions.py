@@ -6,18 +6,21 @@ Version: 1.0.0
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional, Any, Set, TYPE_CHECKING
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, Iterable, List, Mapping, Tuple, Optional, Any, Set, TYPE_CHECKING
 from enum import Enum
+from types import MappingProxyType
+from bisect import bisect_right
+import logging
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.engine import Rarity, colored_text
+from core.engine import DATACLASS_SLOTS, Rarity, colored_text
 
 if TYPE_CHECKING:
     from core.character import Character
 
+logger = logging.getLogger(__name__)
+
 
 class FactionType(Enum):
     """Types of factions"""
@@ -58,7 +61,46 @@ class FactionRank(Enum):
         self.max_rep = max_rep
 
 
-@dataclass
+# Rank bounds in ascending order, for bisecting a reputation value. Slot i of
+# _RANK_LOOKUP holds the rank for bisect_right(_RANK_BOUNDS, rep) == i; values
+# below the lowest or past the highest bound fall back to Neutral.
+_RANKS: Tuple[FactionRank, ...] = tuple(sorted(FactionRank, key=lambda rank: rank.min_rep))
+_RANK_BOUNDS: Tuple[int, ...] = tuple(rank.min_rep for rank in _RANKS) + (_RANKS[-1].max_rep,)
+_RANK_LOOKUP: Tuple[FactionRank, ...] = (FactionRank.NEUTRAL,) + _RANKS + (FactionRank.NEUTRAL,)
+
+# Shop price multiplier at each rank
+_SHOP_DISCOUNTS: Dict[FactionRank, float] = {
+    FactionRank.OUTCAST: 1.5,      # 50% more expensive
+    FactionRank.HOSTILE: 1.25,     # 25% more expensive
+    FactionRank.UNFRIENDLY: 1.1,   # 10% more expensive
+    FactionRank.NEUTRAL: 1.0,      # Normal price
+    FactionRank.FRIENDLY: 0.9,     # 10% discount
+    FactionRank.HONORED: 0.8,      # 20% discount
+    FactionRank.REVERED: 0.7,      # 30% discount
+    FactionRank.EXALTED: 0.6,      # 40% discount
+}
+
+_SEP60 = "=" * 60
+
+# Key of each rank in a faction's benefits table
+_RANK_BENEFIT_KEYS: Dict[FactionRank, str] = {
+    rank: sys.intern(rank.name.lower()) for rank in FactionRank
+}
+
+# Display label for each faction type, e.g. "Merchant Company"
+_TYPE_LABEL: Dict[FactionType, str] = {
+    faction_type: faction_type.value.replace('_', ' ').title() for faction_type in FactionType
+}
+
+
+def get_ranks(reputations: Iterable[int]) -> List[FactionRank]:
+    """Get the faction rank for each of several reputation values"""
+    bounds = _RANK_BOUNDS
+    lookup = _RANK_LOOKUP
+    return [lookup[bisect_right(bounds, reputation)] for reputation in reputations]
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Faction:
     """A joinable faction"""
     id: str
@@ -76,28 +118,54 @@ class Faction:
     requirements: Dict[str, Any] = field(default_factory=dict)
     is_joinable: bool = True
     color_code: str = "\033[94m"  # Default blue
+    _enemies_set: Set[str] = field(init=False, repr=False, compare=False)
+    _display_cache: Dict[FactionRank, Tuple[str, str]] = field(init=False, repr=False, compare=False)
+    _colored_name: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Faction ids are dict keys everywhere; interned ids compare by identity
+        intern = sys.intern
+        self.id = intern(self.id)
+        self.enemies = [intern(faction_id) for faction_id in self.enemies]
+        self.allies = [intern(faction_id) for faction_id in self.allies]
+        self._enemies_set = set(self.enemies)
+        self._display_cache = {}
+        self._colored_name = f"{self.color_code}{self.name}\033[0m"
+    
+    def copy(self) -> 'Faction':
+        """Copy this faction with its own lists and tables"""
+        return replace(
+            self,
+            territory=list(self.territory),
+            enemies=list(self.enemies),
+            allies=list(self.allies),
+            shops=list(self.shops),
+            quests=list(self.quests),
+            benefits=dict(self.benefits),
+            requirements=dict(self.requirements),
+        )
+    
+    def add_enemy(self, faction_id: str) -> bool:
+        """Mark a faction as an enemy, returning False if it already was one"""
+        if faction_id in self._enemies_set:
+            return False
+        self._enemies_set.add(faction_id)
+        self.enemies.append(faction_id)
+        self.invalidate_display()
+        return True
+    
+    def invalidate_display(self):
+        """Drop cached display text after the faction changes"""
+        self._display_cache.clear()
+        self._colored_name = f"{self.color_code}{self.name}\033[0m"
     
     def get_relation(self, reputation: int) -> FactionRank:
         """Get faction rank based on reputation"""
-        for rank in FactionRank:
-            if rank.min_rep <= reputation < rank.max_rep:
-                return rank
-        return FactionRank.NEUTRAL
+        return _RANK_LOOKUP[bisect_right(_RANK_BOUNDS, reputation)]
     
     def get_shop_discount(self, reputation: int) -> float:
         """Get shop discount based on reputation"""
-        rank = self.get_relation(reputation)
-        discounts = {
-            FactionRank.OUTCAST: 1.5,      # 50% more expensive
-            FactionRank.HOSTILE: 1.25,     # 25% more expensive
-            FactionRank.UNFRIENDLY: 1.1,   # 10% more expensive
-            FactionRank.NEUTRAL: 1.0,      # Normal price
-            FactionRank.FRIENDLY: 0.9,     # 10% discount
-            FactionRank.HONORED: 0.8,      # 20% discount
-            FactionRank.REVERED: 0.7,      # 30% discount
-            FactionRank.EXALTED: 0.6,      # 40% discount
-        }
-        return discounts.get(rank, 1.0)
+        return _SHOP_DISCOUNTS.get(self.get_relation(reputation), 1.0)
     
     def can_join(self, character: 'Character') -> Tuple[bool, str]:
         """Check if character can join this faction"""
@@ -128,281 +196,288 @@ class Faction:
     def get_display(self, player_reputation: int = 0) -> str:
         """Get formatted faction display"""
         rank = self.get_relation(player_reputation)
+        parts = self._display_cache.get(rank)
+        if parts is None:
+            parts = self._display_cache[rank] = self._render_display(rank)
+        head, tail = parts
+        return f"{head}{player_reputation}{tail}"
+    
+    def _render_display(self, rank: FactionRank) -> Tuple[str, str]:
+        """Render the display text around the reputation value for a rank"""
+        discount = int((1 - _SHOP_DISCOUNTS.get(rank, 1.0)) * 100)
         
-        lines = [
-            f"\n{'='*60}",
-            f"{self.color_code}{self.name}\033[0m",
-            f"{'='*60}",
-            f"Type: {self.faction_type.value.replace('_', ' ').title()}",
-            f"Leader: {self.leader}",
-            f"Headquarters: {self.headquarters}",
-            f"",
-            f"Your Status: {rank.display_name} ({player_reputation} rep)",
-            f"Shop Discount: {int((1 - self.get_shop_discount(player_reputation)) * 100)}%",
-            f"",
-            f"Description:",
-            f"{self.description}",
-        ]
-        
-        if self.territory:
-            lines.append(f"\nTerritory: {', '.join(self.territory)}")
-        
-        if self.allies:
-            lines.append(f"Allies: {', '.join(self.allies)}")
-        
-        if self.enemies:
-            lines.append(f"Enemies: {', '.join(self.enemies)}")
+        territory = f"\n\nTerritory: {', '.join(self.territory)}" if self.territory else ""
+        allies = f"\nAllies: {', '.join(self.allies)}" if self.allies else ""
+        enemies = f"\nEnemies: {', '.join(self.enemies)}" if self.enemies else ""
         
         # Show benefits at current rank
-        rank_benefits = self.benefits.get(rank.name.lower(), [])
+        rank_benefits = self.benefits.get(_RANK_BENEFIT_KEYS[rank], [])
+        benefits = ""
         if rank_benefits:
-            lines.append(f"\nBenefits at {rank.display_name}:")
-            for benefit in rank_benefits:
-                lines.append(f"  • {benefit}")
+            benefits = f"\n\nBenefits at {rank.display_name}:" + "".join(
+                f"\n  • {benefit}" for benefit in rank_benefits
+            )
         
-        return "\n".join(lines)
+        head = (
+            f"\n{_SEP60}\n"
+            f"{self._colored_name}\n"
+            f"{_SEP60}\n"
+            f"Type: {_TYPE_LABEL[self.faction_type]}\n"
+            f"Leader: {self.leader}\n"
+            f"Headquarters: {self.headquarters}\n"
+            f"\n"
+            f"Your Status: {rank.display_name} ("
+        )
+        tail = (
+            f" rep)\n"
+            f"Shop Discount: {discount}%\n"
+            f"\n"
+            f"Description:\n"
+            f"{self.description}"
+            f"{territory}{allies}{enemies}{benefits}"
+        )
+        return head, tail
     
     def to_dict(self) -> Dict:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "faction_type": self.faction_type.value,
-            "leader": self.leader,
-            "headquarters": self.headquarters,
-            "territory": self.territory,
-            "enemies": self.enemies,
-            "allies": self.allies,
-            "shops": self.shops,
-            "quests": self.quests,
-            "benefits": self.benefits,
-            "requirements": self.requirements,
-            "is_joinable": self.is_joinable,
-            "color_code": self.color_code
-        }
+        data = {name: getattr(self, name) for name in _FACTION_FIELDS}
+        data["faction_type"] = self.faction_type.value
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Faction':
-        return cls(
-            id=data["id"],
-            name=data["name"],
-            description=data["description"],
-            faction_type=FactionType(data["faction_type"]),
-            leader=data.get("leader", ""),
-            headquarters=data.get("headquarters", ""),
-            territory=data.get("territory", []),
-            enemies=data.get("enemies", []),
-            allies=data.get("allies", []),
-            shops=data.get("shops", []),
-            quests=data.get("quests", []),
-            benefits=data.get("benefits", {}),
-            requirements=data.get("requirements", {}),
-            is_joinable=data.get("is_joinable", True),
-            color_code=data.get("color_code", "\033[94m")
-        )
+        kwargs = {name: data[name] for name in _FACTION_FIELDS if name in data}
+        kwargs["faction_type"] = FactionType(data["faction_type"])
+        return cls(**kwargs)
+
+
+# Serialized Faction fields, in declaration order
+_FACTION_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(Faction) if f.init)
+
+
+def _build_default_factions() -> Dict[str, Faction]:
+    """Build the default factions"""
+    return {
+        # Kingdoms
+        "kingdom_aldor": Faction(
+            id="kingdom_aldor",
+            name="Kingdom of Aldor",
+            description="The largest human kingdom, known for its strong military and prosperous cities.",
+            faction_type=FactionType.KINGDOM,
+            leader="King Aldric III",
+            headquarters="capital_city",
+            territory=["capital_city", "trade_road", "start_village"],
+            allies=["guild_merchants", "order_paladins"],
+            enemies=["cult_shadows", "tribe_orks"],
+            shops=["royal_armory", "royal_apothecary"],
+            quests=["defend_the_realm", "royal_delivery"],
+            benefits={
+                "friendly": ["Access to Royal Shops"],
+                "honored": ["10% Discount", "Royal Guard Assistance"],
+                "revered": ["20% Discount", "Access to Royal Vault"],
+                "exalted": ["30% Discount", "Noble Title", "Castle Access"]
+            },
+            requirements={"level": 5},
+            color_code="\033[93m"  # Gold
+        ),
+        
+        "kingdom_valoria": Faction(
+            id="kingdom_valoria",
+            name="Kingdom of Valoria",
+            description="A rival kingdom to the north, focused on magic and scholarship.",
+            faction_type=FactionType.KINGDOM,
+            leader="Queen Elara",
+            headquarters="valoria_city",
+            territory=["valoria_city", "mystic_sanctuary"],
+            allies=["order_mages", "scholarly_academy"],
+            enemies=["kingdom_aldor", "cult_shadows"],
+            shops=["magic_emporium", "arcane_library"],
+            quests=["magical_research", "arcane_defense"],
+            benefits={
+                "friendly": ["Access to Magic Shops"],
+                "honored": ["Magic Training", "Spell Discounts"],
+                "revered": ["Rare Spell Access", "Arcane Knowledge"],
+                "exalted": ["Archmage Title", "Legendary Spells"]
+            },
+            requirements={"level": 8, "class": "Mage"},
+            color_code="\033[96m"  # Cyan
+        ),
+        
+        # Guilds
+        "guild_merchants": Faction(
+            id="guild_merchants",
+            name="Merchant's Guild",
+            description="A powerful organization of traders and businessmen.",
+            faction_type=FactionType.GUILD,
+            leader="Guild Master Thorne",
+            headquarters="capital_city",
+            territory=["capital_city", "trade_road"],
+            allies=["kingdom_aldor"],
+            enemies=["criminal_thieves"],
+            shops=["guild_market", "auction_house"],
+            quests=["trade_route", "rare_goods"],
+            benefits={
+                "friendly": ["Better Trade Prices"],
+                "honored": ["Guild Bank Access", "Investment Options"],
+                "revered": ["Exclusive Goods", "Trade Secrets"],
+                "exalted": ["Guild Master Title", "Trade Monopoly"]
+            },
+            requirements={"level": 3},
+            color_code="\033[92m"  # Green
+        ),
+        
+        "guild_adventurers": Faction(
+            id="guild_adventurers",
+            name="Adventurer's Guild",
+            description="An organization for brave souls who seek fortune and glory.",
+            faction_type=FactionType.GUILD,
+            leader="Grand Master Vex",
+            headquarters="capital_city",
+            territory=["capital_city", "all_dungeons"],
+            allies=["kingdom_aldor", "kingdom_valoria"],
+            enemies=["cult_shadows", "criminal_thieves"],
+            shops=["adventurer_supplies", "dungeon_maps"],
+            quests=["dungeon_exploration", "monster_hunts", "treasure_recovery"],
+            benefits={
+                "friendly": ["Quest Board Access"],
+                "honored": ["Healing Services", "Equipment Repair"],
+                "revered": ["Rare Quests", "Guild Hall Access"],
+                "exalted": ["Guild Leader Title", "Legendary Quests"]
+            },
+            requirements={"level": 1},
+            color_code="\033[91m"  # Red
+        ),
+        
+        # Religious Orders
+        "order_paladins": Faction(
+            id="order_paladins",
+            name="Order of the Radiant Light",
+            description="Holy warriors dedicated to protecting the innocent.",
+            faction_type=FactionType.ORDER,
+            leader="Grand Paladin Michael",
+            headquarters="temple",
+            territory=["temple", "capital_city"],
+            allies=["kingdom_aldor", "religious_temple"],
+            enemies=["cult_shadows", "undead_horde"],
+            shops=["holy_reliquary", "blessed_armory"],
+            quests=["undead_slaying", "holy_crusade", "temple_defense"],
+            benefits={
+                "friendly": ["Holy Blessing"],
+                "honored": ["Divine Protection", "Healing Discount"],
+                "revered": ["Holy Weapons", "Sacred Knowledge"],
+                "exalted": ["Paladin Title", "Divine Mount"]
+            },
+            requirements={"level": 10, "class": "Paladin"},
+            color_code="\033[97m"  # White
+        ),
+        
+        "order_mages": Faction(
+            id="order_mages",
+            name="Order of the Arcane",
+            description="An organization of mages dedicated to magical research.",
+            faction_type=FactionType.ORDER,
+            leader="Archmage Zephos",
+            headquarters="mystic_sanctuary",
+            territory=["mystic_sanctuary", "valoria_city"],
+            allies=["kingdom_valoria", "scholarly_academy"],
+            enemies=["cult_shadows"],
+            shops=["arcane_library", "magical_components"],
+            quests=["magical_research", "artifact_recovery"],
+            benefits={
+                "friendly": ["Library Access"],
+                "honored": ["Spell Training", "Component Discounts"],
+                "revered": ["Rare Spells", "Arcane Secrets"],
+                "exalted": ["Archmage Title", "Legendary Magic"]
+            },
+            requirements={"level": 8, "class": "Mage"},
+            color_code="\033[95m"  # Magenta
+        ),
+        
+        # Criminal
+        "criminal_thieves": Faction(
+            id="criminal_thieves",
+            name="Thieves' Guild",
+            description="A secret organization of rogues and criminals.",
+            faction_type=FactionType.CRIMINAL,
+            leader="The Shadow Master",
+            headquarters="hidden",
+            territory=["underground", "shadow_district"],
+            allies=[],
+            enemies=["kingdom_aldor", "guild_merchants", "guild_adventurers"],
+            shops=["black_market", "stolen_goods"],
+            quests=["heist", "assassination", "smuggling"],
+            benefits={
+                "friendly": ["Black Market Access"],
+                "honored": ["Lockpicking Training", "Poison Recipes"],
+                "revered": ["Master Thief Tools", "Assassin Contracts"],
+                "exalted": ["Shadow Master Title", "Guild Leadership"]
+            },
+            requirements={"level": 5, "class": "Rogue"},
+            is_joinable=True,
+            color_code="\033[90m"  # Gray
+        ),
+        
+        # Cults
+        "cult_shadows": Faction(
+            id="cult_shadows",
+            name="Cult of Shadows",
+            description="A dark cult that worships forbidden powers.",
+            faction_type=FactionType.CULT,
+            leader="The Shadow Lord",
+            headquarters="forgotten_temple",
+            territory=["underground_ruins", "dark_forest"],
+            allies=["undead_horde"],
+            enemies=["kingdom_aldor", "kingdom_valoria", "order_paladins", "order_mages"],
+            shops=["dark_reliquary", "forbidden_knowledge"],
+            quests=["dark_ritual", "corruption", "summoning"],
+            benefits={
+                "friendly": ["Dark Magic Access"],
+                "honored": ["Shadow Powers", "Forbidden Knowledge"],
+                "revered": ["Dark Artifacts", "Demon Summoning"],
+                "exalted": ["Shadow Lord Title", "Immortality Ritual"]
+            },
+            requirements={"level": 15, "class": "Necromancer"},
+            is_joinable=True,
+            color_code="\033[91m"  # Dark Red
+        ),
+    }
+
+
+# Default factions, built once and copied into each manager on first use
+_DEFAULT_FACTIONS: Mapping[str, Faction] = MappingProxyType(_build_default_factions())
 
 
 class FactionManager:
     """Manages all factions and player reputation"""
     
     def __init__(self):
-        self.factions: Dict[str, Faction] = {}
+        self._factions: Dict[str, Faction] = {}
+        self._pending: Mapping[str, Faction] = _DEFAULT_FACTIONS
         self.faction_wars: List[Tuple[str, str]] = []  # Pairs of warring factions
-        self._init_factions()
     
-    def _init_factions(self):
-        """Initialize default factions"""
-        default_factions = {
-            # Kingdoms
-            "kingdom_aldor": Faction(
-                id="kingdom_aldor",
-                name="Kingdom of Aldor",
-                description="The largest human kingdom, known for its strong military and prosperous cities.",
-                faction_type=FactionType.KINGDOM,
-                leader="King Aldric III",
-                headquarters="capital_city",
-                territory=["capital_city", "trade_road", "start_village"],
-                allies=["guild_merchants", "order_paladins"],
-                enemies=["cult_shadows", "tribe_orks"],
-                shops=["royal_armory", "royal_apothecary"],
-                quests=["defend_the_realm", "royal_delivery"],
-                benefits={
-                    "friendly": ["Access to Royal Shops"],
-                    "honored": ["10% Discount", "Royal Guard Assistance"],
-                    "revered": ["20% Discount", "Access to Royal Vault"],
-                    "exalted": ["30% Discount", "Noble Title", "Castle Access"]
-                },
-                requirements={"level": 5},
-                color_code="\033[93m"  # Gold
-            ),
-            
-            "kingdom_valoria": Faction(
-                id="kingdom_valoria",
-                name="Kingdom of Valoria",
-                description="A rival kingdom to the north, focused on magic and scholarship.",
-                faction_type=FactionType.KINGDOM,
-                leader="Queen Elara",
-                headquarters="valoria_city",
-                territory=["valoria_city", "mystic_sanctuary"],
-                allies=["order_mages", "scholarly_academy"],
-                enemies=["kingdom_aldor", "cult_shadows"],
-                shops=["magic_emporium", "arcane_library"],
-                quests=["magical_research", "arcane_defense"],
-                benefits={
-                    "friendly": ["Access to Magic Shops"],
-                    "honored": ["Magic Training", "Spell Discounts"],
-                    "revered": ["Rare Spell Access", "Arcane Knowledge"],
-                    "exalted": ["Archmage Title", "Legendary Spells"]
-                },
-                requirements={"level": 8, "class": "Mage"},
-                color_code="\033[96m"  # Cyan
-            ),
-            
-            # Guilds
-            "guild_merchants": Faction(
-                id="guild_merchants",
-                name="Merchant's Guild",
-                description="A powerful organization of traders and businessmen.",
-                faction_type=FactionType.GUILD,
-                leader="Guild Master Thorne",
-                headquarters="capital_city",
-                territory=["capital_city", "trade_road"],
-                allies=["kingdom_aldor"],
-                enemies=["criminal_thieves"],
-                shops=["guild_market", "auction_house"],
-                quests=["trade_route", "rare_goods"],
-                benefits={
-                    "friendly": ["Better Trade Prices"],
-                    "honored": ["Guild Bank Access", "Investment Options"],
-                    "revered": ["Exclusive Goods", "Trade Secrets"],
-                    "exalted": ["Guild Master Title", "Trade Monopoly"]
-                },
-                requirements={"level": 3},
-                color_code="\033[92m"  # Green
-            ),
-            
-            "guild_adventurers": Faction(
-                id="guild_adventurers",
-                name="Adventurer's Guild",
-                description="An organization for brave souls who seek fortune and glory.",
-                faction_type=FactionType.GUILD,
-                leader="Grand Master Vex",
-                headquarters="capital_city",
-                territory=["capital_city", "all_dungeons"],
-                allies=["kingdom_aldor", "kingdom_valoria"],
-                enemies=["cult_shadows", "criminal_thieves"],
-                shops=["adventurer_supplies", "dungeon_maps"],
-                quests=["dungeon_exploration", "monster_hunts", "treasure_recovery"],
-                benefits={
-                    "friendly": ["Quest Board Access"],
-                    "honored": ["Healing Services", "Equipment Repair"],
-                    "revered": ["Rare Quests", "Guild Hall Access"],
-                    "exalted": ["Guild Leader Title", "Legendary Quests"]
-                },
-                requirements={"level": 1},
-                color_code="\033[91m"  # Red
-            ),
-            
-            # Religious Orders
-            "order_paladins": Faction(
-                id="order_paladins",
-                name="Order of the Radiant Light",
-                description="Holy warriors dedicated to protecting the innocent.",
-                faction_type=FactionType.ORDER,
-                leader="Grand Paladin Michael",
-                headquarters="temple",
-                territory=["temple", "capital_city"],
-                allies=["kingdom_aldor", "religious_temple"],
-                enemies=["cult_shadows", "undead_horde"],
-                shops=["holy_reliquary", "blessed_armory"],
-                quests=["undead_slaying", "holy_crusade", "temple_defense"],
-                benefits={
-                    "friendly": ["Holy Blessing"],
-                    "honored": ["Divine Protection", "Healing Discount"],
-                    "revered": ["Holy Weapons", "Sacred Knowledge"],
-                    "exalted": ["Paladin Title", "Divine Mount"]
-                },
-                requirements={"level": 10, "class": "Paladin"},
-                color_code="\033[97m"  # White
-            ),
-            
-            "order_mages": Faction(
-                id="order_mages",
-                name="Order of the Arcane",
-                description="An organization of mages dedicated to magical research.",
-                faction_type=FactionType.ORDER,
-                leader="Archmage Zephos",
-                headquarters="mystic_sanctuary",
-                territory=["mystic_sanctuary", "valoria_city"],
-                allies=["kingdom_valoria", "scholarly_academy"],
-                enemies=["cult_shadows"],
-                shops=["arcane_library", "magical_components"],
-                quests=["magical_research", "artifact_recovery"],
-                benefits={
-                    "friendly": ["Library Access"],
-                    "honored": ["Spell Training", "Component Discounts"],
-                    "revered": ["Rare Spells", "Arcane Secrets"],
-                    "exalted": ["Archmage Title", "Legendary Magic"]
-                },
-                requirements={"level": 8, "class": "Mage"},
-                color_code="\033[95m"  # Magenta
-            ),
-            
-            # Criminal
-            "criminal_thieves": Faction(
-                id="criminal_thieves",
-                name="Thieves' Guild",
-                description="A secret organization of rogues and criminals.",
-                faction_type=FactionType.CRIMINAL,
-                leader="The Shadow Master",
-                headquarters="hidden",
-                territory=["underground", "shadow_district"],
-                allies=[],
-                enemies=["kingdom_aldor", "guild_merchants", "guild_adventurers"],
-                shops=["black_market", "stolen_goods"],
-                quests=["heist", "assassination", "smuggling"],
-                benefits={
-                    "friendly": ["Black Market Access"],
-                    "honored": ["Lockpicking Training", "Poison Recipes"],
-                    "revered": ["Master Thief Tools", "Assassin Contracts"],
-                    "exalted": ["Shadow Master Title", "Guild Leadership"]
-                },
-                requirements={"level": 5, "class": "Rogue"},
-                is_joinable=True,
-                color_code="\033[90m"  # Gray
-            ),
-            
-            # Cults
-            "cult_shadows": Faction(
-                id="cult_shadows",
-                name="Cult of Shadows",
-                description="A dark cult that worships forbidden powers.",
-                faction_type=FactionType.CULT,
-                leader="The Shadow Lord",
-                headquarters="forgotten_temple",
-                territory=["underground_ruins", "dark_forest"],
-                allies=["undead_horde"],
-                enemies=["kingdom_aldor", "kingdom_valoria", "order_paladins", "order_mages"],
-                shops=["dark_reliquary", "forbidden_knowledge"],
-                quests=["dark_ritual", "corruption", "summoning"],
-                benefits={
-                    "friendly": ["Dark Magic Access"],
-                    "honored": ["Shadow Powers", "Forbidden Knowledge"],
-                    "revered": ["Dark Artifacts", "Demon Summoning"],
-                    "exalted": ["Shadow Lord Title", "Immortality Ritual"]
-                },
-                requirements={"level": 15, "class": "Necromancer"},
-                is_joinable=True,
-                color_code="\033[91m"  # Dark Red
-            ),
+    @property
+    def factions(self) -> Dict[str, Faction]:
+        """All factions, building any defaults not yet constructed"""
+        if self._pending:
+            self._build_pending()
+        return self._factions
+    
+    def _build_pending(self):
+        """Build the remaining default factions, keeping their declared order"""
+        built = self._factions
+        self._factions = {
+            faction_id: built[faction_id] if faction_id in built else default.copy()
+            for faction_id, default in self._pending.items()
         }
-        
-        for faction_id, faction in default_factions.items():
-            self.factions[faction_id] = faction
+        self._pending = {}
     
     def get_faction(self, faction_id: str) -> Optional[Faction]:
         """Get faction by ID"""
-        return self.factions.get(faction_id)
+        faction = self._factions.get(faction_id)
+        if faction is None:
+            default = self._pending.get(faction_id)
+            if default is not None:
+                faction = self._factions[faction_id] = default.copy()
+        return faction
     
     def get_all_factions(self) -> List[Faction]:
         """Get all factions"""
@@ -419,17 +494,51 @@ class FactionManager:
     
     def modify_reputation(self, character: 'Character', faction_id: str, amount: int) -> str:
         """Modify character's reputation with a faction"""
-        if faction_id not in self.factions:
+        faction = self.get_faction(faction_id)
+        if faction is None:
             return f"Faction {faction_id} not found."
         
         current_rep = character.reputation.get(faction_id, 0)
         new_rep = current_rep + amount
         character.reputation[faction_id] = new_rep
         
-        faction = self.factions[faction_id]
         old_rank = faction.get_relation(current_rep)
         new_rank = faction.get_relation(new_rep)
+        return self._reputation_message(faction, amount, new_rep, old_rank, new_rank)
+    
+    def modify_reputations(self, character: 'Character', changes: Mapping[str, int]) -> List[str]:
+        """Apply several reputation changes at once, one message per change"""
+        reputation = character.reputation
+        messages: List[Optional[str]] = []
+        applied: List[Tuple[int, Faction, int]] = []
+        old_reps: List[int] = []
+        new_reps: List[int] = []
+        
+        for faction_id, amount in changes.items():
+            faction = self.get_faction(faction_id)
+            if faction is None:
+                messages.append(f"Faction {faction_id} not found.")
+                continue
+            current_rep = reputation.get(faction_id, 0)
+            new_rep = current_rep + amount
+            reputation[faction_id] = new_rep
+            applied.append((len(messages), faction, amount))
+            messages.append(None)
+            old_reps.append(current_rep)
+            new_reps.append(new_rep)
         
+        # Resolve every old and new rank in two passes over the rank table
+        for (index, faction, amount), new_rep, old_rank, new_rank in zip(
+            applied, new_reps, get_ranks(old_reps), get_ranks(new_reps)
+        ):
+            messages[index] = self._reputation_message(faction, amount, new_rep, old_rank, new_rank)
+        
+        return messages
+    
+    @staticmethod
+    def _reputation_message(faction: Faction, amount: int, new_rep: int,
+                            old_rank: FactionRank, new_rank: FactionRank) -> str:
+        """Describe a reputation change, calling out rank changes"""
         # Check for rank change
         if old_rank != new_rank:
             if amount > 0:
@@ -447,12 +556,15 @@ class FactionManager:
             f"{'='*60}"
         ]
         
-        for faction in self.factions.values():
-            rep = character.reputation.get(faction.id, 0)
-            rank = faction.get_relation(rep)
-            status = "✓ Member" if faction.id in getattr(character, 'factions', []) else rank.display_name
-            lines.append(f"\n{faction.color_code}{faction.name}\033[0m - {status} ({rep} rep)")
-            lines.append(f"  Type: {faction.faction_type.value.replace('_', ' ').title()}")
+        factions = self.factions.values()
+        reputation = character.reputation
+        reps = [reputation.get(faction.id, 0) for faction in factions]
+        memberships = set(getattr(character, 'factions', ()))
+        
+        for faction, rep, rank in zip(factions, reps, get_ranks(reps)):
+            status = "✓ Member" if faction.id in memberships else rank.display_name
+            lines.append(f"\n{faction._colored_name} - {status} ({rep} rep)")
+            lines.append(f"  Type: {_TYPE_LABEL[faction.faction_type]}")
             if faction.headquarters:
                 lines.append(f"  HQ: {faction.headquarters}")
         
@@ -460,17 +572,16 @@ class FactionManager:
     
     def declare_war(self, faction1_id: str, faction2_id: str):
         """Declare war between two factions"""
-        if faction1_id in self.factions and faction2_id in self.factions:
+        faction1_id = sys.intern(faction1_id)
+        faction2_id = sys.intern(faction2_id)
+        f1 = self.get_faction(faction1_id)
+        f2 = self.get_faction(faction2_id)
+        if f1 is not None and f2 is not None:
             self.faction_wars.append((faction1_id, faction2_id))
             
             # Update enemy lists
-            f1 = self.factions[faction1_id]
-            f2 = self.factions[faction2_id]
-            
-            if faction2_id not in f1.enemies:
-                f1.enemies.append(faction2_id)
-            if faction1_id not in f2.enemies:
-                f2.enemies.append(faction1_id)
+            f1.add_enemy(faction2_id)
+            f2.add_enemy(faction1_id)
     
     def to_dict(self) -> Dict:
         return {
@@ -481,9 +592,10 @@ class FactionManager:
     @classmethod
     def from_dict(cls, data: Dict) -> 'FactionManager':
         fm = cls.__new__(cls)
-        fm.factions = {k: Faction.from_dict(v) for k, v in data.get("factions", {}).items()}
+        fm._factions = {sys.intern(k): Faction.from_dict(v) for k, v in data.get("factions", {}).items()}
+        fm._pending = {}
         fm.faction_wars = data.get("faction_wars", [])
         return fm
 
 
-print("Faction system loaded successfully!")
+logger.debug("Faction system loaded successfully!")
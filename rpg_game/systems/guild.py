@@ -7,46 +7,91 @@ Version: 1.0.0
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional, Any, Set, TYPE_CHECKING
-from enum import Enum
-import time
+from typing import Callable, Dict, FrozenSet, List, Tuple, Optional, Any, Set, TYPE_CHECKING
+from enum import IntEnum
+from itertools import islice
+from bisect import bisect_right
+import hashlib
+import logging
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
 
-from core.engine import Rarity, colored_text, format_number
+from core.engine import DATACLASS_SLOTS, Rarity, colored_text, format_number
 
 if TYPE_CHECKING:
     from core.character import Character
 
+logger = logging.getLogger(__name__)
+
 
-class GuildRank(Enum):
+class GuildRank(IntEnum):
     """Ranks within a guild"""
-    RECRUIT = ("Recruit", 0)
-    MEMBER = ("Member", 1)
-    VETERAN = ("Veteran", 2)
-    OFFICER = ("Officer", 3)
-    LEADER = ("Leader", 4)
-    
-    def __init__(self, display_name: str, level: int):
-        self.display_name = display_name
-        self.level = level
+    RECRUIT = (0, "Recruit")
+    MEMBER = (1, "Member")
+    VETERAN = (2, "Veteran")
+    OFFICER = (3, "Officer")
+    LEADER = (4, "Leader")
+    
+    def __new__(cls, level: int, display_name: str):
+        rank = int.__new__(cls, level)
+        rank._value_ = level
+        rank.display_name = display_name
+        rank.level = level
+        return rank
+
+
+# Neighbouring ranks, for promotion and demotion
+_RANKS_ORDERED: Tuple[GuildRank, ...] = tuple(GuildRank)
+_RANK_NEXT: Dict[GuildRank, GuildRank] = dict(zip(_RANKS_ORDERED, _RANKS_ORDERED[1:]))
+_RANK_PREV: Dict[GuildRank, GuildRank] = dict(zip(_RANKS_ORDERED[1:], _RANKS_ORDERED))
 
+# Saved rank value -> rank, skipping Enum.__call__ when loading
+_RANK_BY_VALUE: Dict[int, GuildRank] = {rank.value: rank for rank in GuildRank}
 
-class GuildPermission(Enum):
+
+class GuildPermission(IntEnum):
     """Permissions for guild ranks"""
-    INVITE = "invite"
-    KICK = "kick"
-    PROMOTE = "promote"
-    DEMOTE = "demote"
-    BANK_DEPOSIT = "bank_deposit"
-    BANK_WITHDRAW = "bank_withdraw"
-    MISSION_START = "mission_start"
-    UPGRADE_GUILD = "upgrade_guild"
-    EDIT_MOTD = "edit_motd"
+    INVITE = 1
+    KICK = 2
+    PROMOTE = 3
+    DEMOTE = 4
+    BANK_DEPOSIT = 5
+    BANK_WITHDRAW = 6
+    MISSION_START = 7
+    UPGRADE_GUILD = 8
+    EDIT_MOTD = 9
+
+
+# Permissions are saved by lower-cased name, e.g. "bank_deposit"
+_PERM_KEY: Dict[GuildPermission, str] = {perm: perm.name.lower() for perm in GuildPermission}
+_PERM_BY_KEY: Dict[str, GuildPermission] = {key: perm for perm, key in _PERM_KEY.items()}
+
+_SEP60 = "=" * 60
+
+MAX_GUILD_LEVEL = 10
+
+# Experience needed to leave each guild level, indexed by level - 1
+_EXP_TO_LEVEL: Tuple[int, ...] = tuple(int(1000 * (1.5 ** i)) for i in range(MAX_GUILD_LEVEL))
 
+# Shared default for ranks with no permissions entry
+_NO_PERMISSIONS: FrozenSet[GuildPermission] = frozenset()
+_ALL_PERMISSIONS: FrozenSet[GuildPermission] = frozenset(GuildPermission)
 
-@dataclass
+# Permissions each rank starts with; the sets are immutable, so guilds share them
+_DEFAULT_PERMISSIONS: Dict[int, FrozenSet[GuildPermission]] = {
+    GuildRank.RECRUIT.value: frozenset([GuildPermission.BANK_DEPOSIT]),
+    GuildRank.MEMBER.value: frozenset([GuildPermission.BANK_DEPOSIT, GuildPermission.BANK_WITHDRAW]),
+    GuildRank.VETERAN.value: frozenset([GuildPermission.BANK_DEPOSIT, GuildPermission.BANK_WITHDRAW, 
+                                        GuildPermission.INVITE, GuildPermission.MISSION_START]),
+    GuildRank.OFFICER.value: frozenset([GuildPermission.BANK_DEPOSIT, GuildPermission.BANK_WITHDRAW,
+                                        GuildPermission.INVITE, GuildPermission.KICK, 
+                                        GuildPermission.PROMOTE, GuildPermission.DEMOTE,
+                                        GuildPermission.MISSION_START, GuildPermission.EDIT_MOTD]),
+    GuildRank.LEADER.value: _ALL_PERMISSIONS
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class GuildMember:
     """A member of a guild"""
     character_id: str
@@ -57,6 +102,11 @@ class GuildMember:
     last_online: float = 0
     is_online: bool = False
     
+    def __post_init__(self):
+        # Member IDs and names repeat across guild rosters and saves
+        self.character_id = sys.intern(self.character_id)
+        self.character_name = sys.intern(self.character_name)
+    
     def to_dict(self) -> Dict:
         return {
             "character_id": self.character_id,
@@ -73,7 +123,7 @@ class GuildMember:
         return cls(
             character_id=data["character_id"],
             character_name=data["character_name"],
-            rank=GuildRank(data["rank"]),
+            rank=_RANK_BY_VALUE[data["rank"]],
             joined_at=data["joined_at"],
             contribution_points=data.get("contribution_points", 0),
             last_online=data.get("last_online", 0),
@@ -81,7 +131,7 @@ class GuildMember:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class GuildMission:
     """A guild mission/quest"""
     id: str
@@ -128,7 +178,7 @@ class GuildMission:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Guild:
     """A player guild"""
     id: str
@@ -143,27 +193,42 @@ class Guild:
     bank_gold: int = 0
     bank_items: List[Dict[str, Any]] = field(default_factory=list)
     motd: str = "Welcome to the guild!"
-    permissions: Dict[str, List[GuildPermission]] = field(default_factory=dict)
+    permissions: Dict[int, FrozenSet[GuildPermission]] = field(default_factory=dict)
     active_mission: Optional[str] = None
     completed_missions: int = 0
     total_contributions: int = 0
     max_members: int = 20
     upgrades: List[str] = field(default_factory=list)
+    # Called as (guild, character_id, joined) when the roster changes
+    _on_member_change: Optional[Callable[['Guild', str, bool], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # IDs of online members, in the order they came online
+    _online_ids: Dict[str, None] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         # Set default permissions if not set
         if not self.permissions:
-            self.permissions = {
-                GuildRank.RECRUIT.value: [GuildPermission.BANK_DEPOSIT],
-                GuildRank.MEMBER.value: [GuildPermission.BANK_DEPOSIT, GuildPermission.BANK_WITHDRAW],
-                GuildRank.VETERAN.value: [GuildPermission.BANK_DEPOSIT, GuildPermission.BANK_WITHDRAW, 
-                                         GuildPermission.INVITE, GuildPermission.MISSION_START],
-                GuildRank.OFFICER.value: [GuildPermission.BANK_DEPOSIT, GuildPermission.BANK_WITHDRAW,
-                                         GuildPermission.INVITE, GuildPermission.KICK, 
-                                         GuildPermission.PROMOTE, GuildPermission.DEMOTE,
-                                         GuildPermission.MISSION_START, GuildPermission.EDIT_MOTD],
-                GuildRank.LEADER.value: list(GuildPermission)  # All permissions
-            }
+            self.permissions = dict(_DEFAULT_PERMISSIONS)
+        self._rebuild_online()
+    
+    def _rebuild_online(self):
+        """Rebuild the online-member index from the roster"""
+        self._online_ids = {cid: None for cid, member in self.members.items() if member.is_online}
+    
+    def set_member_online(self, character_id: str, online: bool) -> bool:
+        """Mark a member as online or offline"""
+        member = self.members.get(character_id)
+        if member is None:
+            return False
+        
+        member.is_online = online
+        member.last_online = time.time()
+        if online:
+            self._online_ids[character_id] = None
+        else:
+            self._online_ids.pop(character_id, None)
+        return True
     
     def get_member(self, character_id: str) -> Optional[GuildMember]:
         """Get a guild member by character ID"""
@@ -187,53 +252,49 @@ class Guild:
         )
         
         self.members[character.id] = member
+        self._online_ids[character.id] = None
+        if self._on_member_change is not None:
+            self._on_member_change(self, character.id, True)
         return True, f"Welcome to {self.name}, {character.name}!"
     
     def remove_member(self, character_id: str) -> Tuple[bool, str]:
         """Remove a member from the guild"""
-        if character_id not in self.members:
+        member = self.members.get(character_id)
+        if member is None:
             return False, "Not a member."
         
-        member = self.members[character_id]
         if member.rank == GuildRank.LEADER:
             return False, "Cannot remove the guild leader."
         
         del self.members[character_id]
+        self._online_ids.pop(character_id, None)
+        if self._on_member_change is not None:
+            self._on_member_change(self, character_id, False)
         return True, "Member removed."
     
     def promote_member(self, character_id: str) -> Tuple[bool, str]:
         """Promote a member to next rank"""
-        if character_id not in self.members:
+        member = self.members.get(character_id)
+        if member is None:
             return False, "Not a member."
         
-        member = self.members[character_id]
-        current_rank = member.rank
-        
-        if current_rank == GuildRank.LEADER:
+        next_rank = _RANK_NEXT.get(member.rank)
+        if next_rank is None:
             return False, "Already at highest rank."
         
-        # Get next rank
-        ranks = list(GuildRank)
-        next_rank = ranks[ranks.index(current_rank) + 1]
-        
         member.rank = next_rank
         return True, f"Promoted to {next_rank.display_name}!"
     
     def demote_member(self, character_id: str) -> Tuple[bool, str]:
         """Demote a member to previous rank"""
-        if character_id not in self.members:
+        member = self.members.get(character_id)
+        if member is None:
             return False, "Not a member."
         
-        member = self.members[character_id]
-        current_rank = member.rank
-        
-        if current_rank == GuildRank.RECRUIT:
+        prev_rank = _RANK_PREV.get(member.rank)
+        if prev_rank is None:
             return False, "Already at lowest rank."
         
-        # Get previous rank
-        ranks = list(GuildRank)
-        prev_rank = ranks[ranks.index(current_rank) - 1]
-        
         member.rank = prev_rank
         return True, f"Demoted to {prev_rank.display_name}."
     
@@ -243,21 +304,19 @@ class Guild:
         if not member:
             return False
         
-        allowed_permissions = self.permissions.get(member.rank.value, [])
-        return permission in allowed_permissions
+        return permission in self.permissions.get(member.rank.value, _NO_PERMISSIONS)
     
     def deposit_gold(self, character_id: str, amount: int) -> Tuple[bool, str]:
         """Deposit gold into guild bank"""
-        if not self.has_permission(character_id, GuildPermission.BANK_DEPOSIT):
+        member = self.members.get(character_id)
+        if member is None or GuildPermission.BANK_DEPOSIT not in self.permissions.get(member.rank.value, _NO_PERMISSIONS):
             return False, "No permission to deposit."
         
         self.bank_gold += amount
         self.total_contributions += amount
         
         # Add contribution points to member
-        member = self.members.get(character_id)
-        if member:
-            member.contribution_points += amount
+        member.contribution_points += amount
         
         return True, f"Deposited {amount} gold. Guild bank: {self.bank_gold}"
     
@@ -272,12 +331,23 @@ class Guild:
         self.bank_gold -= amount
         return True, f"Withdrew {amount} gold. Guild bank: {self.bank_gold}"
     
+    def contribution_stats(self) -> Tuple[int, int, Optional[str]]:
+        """Get total and highest contribution points, and the top contributor's ID"""
+        if not self.members:
+            return 0, 0, None
+        
+        points = {cid: member.contribution_points for cid, member in self.members.items()}
+        top_id = max(points, key=points.__getitem__)
+        return sum(points.values()), points[top_id], top_id
+    
     def add_experience(self, amount: int) -> bool:
         """Add experience to guild and check for level up"""
         self.experience += amount
+        if self.level >= MAX_GUILD_LEVEL:
+            return False
         
         exp_needed = self.get_exp_to_level()
-        if self.experience >= exp_needed and self.level < 10:
+        if self.experience >= exp_needed:
             self.experience -= exp_needed
             self.level += 1
             self.max_members += 5  # More members per level
@@ -286,37 +356,48 @@ class Guild:
     
     def get_exp_to_level(self) -> int:
         """Calculate experience needed for next guild level"""
+        if 1 <= self.level <= MAX_GUILD_LEVEL:
+            return _EXP_TO_LEVEL[self.level - 1]
         return int(1000 * (1.5 ** (self.level - 1)))
     
     def get_display(self) -> str:
         """Get formatted guild display"""
-        lines = [
-            f"\n{'='*60}",
+        exp_needed = self.get_exp_to_level()
+        bank_str = format_number(self.bank_gold)
+        contrib_str = format_number(self.total_contributions)
+        leader = self.members.get(self.leader_id)
+        leader_name = leader.character_name if leader is not None else "Unknown"
+        
+        # Fixed header first; only the upgrades and online list vary in length
+        lines = ["\n".join((
+            f"\n{_SEP60}",
             f"[{self.tag}] {self.name}",
-            f"{'='*60}",
-            f"Level: {self.level} (EXP: {self.experience}/{self.get_exp_to_level()})",
+            _SEP60,
+            f"Level: {self.level} (EXP: {self.experience}/{exp_needed})",
             f"Members: {len(self.members)}/{self.max_members}",
-            f"Leader: {self.members.get(self.leader_id, GuildMember('', 'Unknown', GuildRank.LEADER, 0)).character_name}",
-            f"",
-            f"Message of the Day:",
+            f"Leader: {leader_name}",
+            "",
+            "Message of the Day:",
             f"  {self.motd}",
-            f"",
-            f"Guild Bank: {format_number(self.bank_gold)} gold",
-            f"Total Contributions: {format_number(self.total_contributions)}",
+            "",
+            f"Guild Bank: {bank_str} gold",
+            f"Total Contributions: {contrib_str}",
             f"Completed Missions: {self.completed_missions}",
-        ]
+        ))]
         
         if self.upgrades:
             lines.append(f"\nUpgrades: {', '.join(self.upgrades)}")
         
         # Show online members
-        online = [m for m in self.members.values() if m.is_online]
-        lines.append(f"\nOnline Members ({len(online)}):")
-        for member in online[:10]:  # Show first 10
+        online_count = len(self._online_ids)
+        lines.append(f"\nOnline Members ({online_count}):")
+        members = self.members
+        for character_id in islice(self._online_ids, 10):  # Show first 10
+            member = members[character_id]
             lines.append(f"  • {member.character_name} [{member.rank.display_name}]")
         
-        if len(online) > 10:
-            lines.append(f"  ... and {len(online) - 10} more")
+        if online_count > 10:
+            lines.append(f"  ... and {online_count - 10} more")
         
         return "\n".join(lines)
     
@@ -330,11 +411,12 @@ class Guild:
             "created_at": self.created_at,
             "level": self.level,
             "experience": self.experience,
-            "members": {k: v.to_dict() for k, v in self.members.items()},
+            "members": {k: _MEMBER_TO_DICT(v) for k, v in self.members.items()},
             "bank_gold": self.bank_gold,
             "bank_items": self.bank_items,
             "motd": self.motd,
-            "permissions": {k: [p.value for p in v] for k, v in self.permissions.items()},
+            # Listed in declaration order so saves are stable across runs
+            "permissions": {k: [_PERM_KEY[p] for p in sorted(v)] for k, v in self.permissions.items()},
             "active_mission": self.active_mission,
             "completed_missions": self.completed_missions,
             "total_contributions": self.total_contributions,
@@ -347,9 +429,9 @@ class Guild:
         guild = cls(
             id=data["id"],
             name=data["name"],
-            tag=data["tag"],
+            tag=sys.intern(data["tag"]),
             description=data["description"],
-            leader_id=data["leader_id"],
+            leader_id=sys.intern(data["leader_id"]),
             created_at=data["created_at"],
             level=data.get("level", 1),
             experience=data.get("experience", 0),
@@ -364,24 +446,61 @@ class Guild:
         )
         
         # Restore members
-        guild.members = {k: GuildMember.from_dict(v) for k, v in data.get("members", {}).items()}
+        member_from_dict = GuildMember.from_dict
+        guild.members = {sys.intern(k): member_from_dict(v) for k, v in data.get("members", {}).items()}
+        guild._rebuild_online()
         
         # Restore permissions
         guild.permissions = {}
         for rank_value, perms in data.get("permissions", {}).items():
-            guild.permissions[rank_value] = [GuildPermission(p) for p in perms]
+            # JSON turns the integer rank keys into strings
+            guild.permissions[int(rank_value)] = frozenset([_PERM_BY_KEY[p] for p in perms])
         
         return guild
 
 
+# Serializers bound once for the per-entry loops in to_dict
+_MEMBER_TO_DICT = GuildMember.to_dict
+_MISSION_TO_DICT = GuildMission.to_dict
+_GUILD_TO_DICT = Guild.to_dict
+
+
 class GuildManager:
     """Manages all guilds"""
     
     def __init__(self):
         self.guilds: Dict[str, Guild] = {}
         self.missions: Dict[str, GuildMission] = {}
+        self._init_indexes()
         self._init_missions()
     
+    def _init_indexes(self):
+        """Set up the lookup indexes over guild names, tags and members"""
+        self._guild_names: Dict[str, str] = {}  # Lower-cased name -> guild ID
+        self._guild_tags: Dict[str, str] = {}  # Lower-cased tag -> guild ID
+        self._member_guild: Dict[str, str] = {}  # Character ID -> guild ID
+    
+    def _index_guild(self, guild: Guild):
+        """Add a guild to the lookup indexes and follow its roster changes"""
+        self._guild_names.setdefault(guild.name.lower(), guild.id)
+        self._guild_tags.setdefault(guild.tag.lower(), guild.id)
+        for character_id in guild.members:
+            self._member_guild.setdefault(character_id, guild.id)
+        guild._on_member_change = self._member_changed
+    
+    def _member_changed(self, guild: Guild, character_id: str, joined: bool):
+        """Keep the member index in step with a guild's roster"""
+        index = self._member_guild
+        if joined:
+            index.setdefault(character_id, guild.id)
+        elif index.get(character_id) == guild.id:
+            del index[character_id]
+            # Fall back to any other guild the character still belongs to
+            for other in self.guilds.values():
+                if character_id in other.members:
+                    index[character_id] = other.id
+                    break
+    
     def _init_missions(self):
         """Initialize default guild missions"""
         default_missions = {
@@ -429,6 +548,19 @@ class GuildManager:
         
         for mission_id, mission in default_missions.items():
             self.missions[mission_id] = mission
+        self._sort_missions()
+    
+    def _sort_missions(self):
+        """Order missions by difficulty so availability is a prefix of the list"""
+        self._missions_by_difficulty: List[GuildMission] = sorted(
+            self.missions.values(), key=lambda m: m.difficulty
+        )
+        self._mission_difficulties: List[int] = [m.difficulty for m in self._missions_by_difficulty]
+    
+    def add_mission(self, mission: GuildMission):
+        """Register a guild mission"""
+        self.missions[mission.id] = mission
+        self._sort_missions()
     
     def create_guild(self, name: str, tag: str, description: str, leader: 'Character') -> Tuple[bool, str, Optional[Guild]]:
         """Create a new guild"""
@@ -440,20 +572,17 @@ class GuildManager:
             return False, "Guild tag must be 2-5 characters.", None
         
         # Check if name/tag exists
-        for guild in self.guilds.values():
-            if guild.name.lower() == name.lower():
-                return False, "Guild name already exists.", None
-            if guild.tag.lower() == tag.lower():
-                return False, "Guild tag already exists.", None
+        if name.lower() in self._guild_names:
+            return False, "Guild name already exists.", None
+        if tag.lower() in self._guild_tags:
+            return False, "Guild tag already exists.", None
         
         # Check if leader is already in a guild
-        for guild in self.guilds.values():
-            if leader.id in guild.members:
-                return False, "You are already in a guild.", None
+        if leader.id in self._member_guild:
+            return False, "You are already in a guild.", None
         
         # Create guild
-        import hashlib
-        guild_id = hashlib.md5(f"{name}{time.time()}".encode()).hexdigest()[:8]
+        guild_id = hashlib.blake2b(f"{name}{time.time_ns()}".encode(), digest_size=4).hexdigest()
         
         guild = Guild(
             id=guild_id,
@@ -464,10 +593,11 @@ class GuildManager:
             created_at=time.time()
         )
         
+        self.guilds[guild_id] = guild
+        self._index_guild(guild)
+        
         # Add leader as member
         guild.add_member(leader, GuildRank.LEADER)
-        
-        self.guilds[guild_id] = guild
         return True, f"Guild '{name}' created successfully!", guild
     
     def get_guild(self, guild_id: str) -> Optional[Guild]:
@@ -476,10 +606,7 @@ class GuildManager:
     
     def get_character_guild(self, character_id: str) -> Optional[Guild]:
         """Get guild that character belongs to"""
-        for guild in self.guilds.values():
-            if character_id in guild.members:
-                return guild
-        return None
+        return self.guilds.get(self._member_guild.get(character_id))
     
     def disband_guild(self, guild_id: str, character_id: str) -> Tuple[bool, str]:
         """Disband a guild (only leader can do this)"""
@@ -491,24 +618,38 @@ class GuildManager:
             return False, "Only the guild leader can disband."
         
         del self.guilds[guild_id]
+        guild._on_member_change = None
+        if self._guild_names.get(guild.name.lower()) == guild_id:
+            del self._guild_names[guild.name.lower()]
+        if self._guild_tags.get(guild.tag.lower()) == guild_id:
+            del self._guild_tags[guild.tag.lower()]
+        for member_id in guild.members:
+            self._member_changed(guild, member_id, False)
         return True, f"Guild '{guild.name}' has been disbanded."
     
     def get_available_missions(self, guild_level: int) -> List[GuildMission]:
-        """Get missions available for guild level"""
-        return [m for m in self.missions.values() if m.difficulty <= guild_level + 2]
+        """Get missions available for guild level, easiest first"""
+        cutoff = bisect_right(self._mission_difficulties, guild_level + 2)
+        return self._missions_by_difficulty[:cutoff]
     
     def to_dict(self) -> Dict:
         return {
-            "guilds": {k: v.to_dict() for k, v in self.guilds.items()},
-            "missions": {k: v.to_dict() for k, v in self.missions.items()}
+            "guilds": {k: _GUILD_TO_DICT(v) for k, v in self.guilds.items()},
+            "missions": {k: _MISSION_TO_DICT(v) for k, v in self.missions.items()}
         }
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'GuildManager':
         gm = cls.__new__(cls)
-        gm.guilds = {k: Guild.from_dict(v) for k, v in data.get("guilds", {}).items()}
-        gm.missions = {k: GuildMission.from_dict(v) for k, v in data.get("missions", {}).items()}
+        guild_from_dict = Guild.from_dict
+        mission_from_dict = GuildMission.from_dict
+        gm.guilds = {k: guild_from_dict(v) for k, v in data.get("guilds", {}).items()}
+        gm.missions = {k: mission_from_dict(v) for k, v in data.get("missions", {}).items()}
+        gm._sort_missions()
+        gm._init_indexes()
+        for guild in gm.guilds.values():
+            gm._index_guild(guild)
         return gm
 
 
-print("Guild system loaded successfully!")
+logger.debug("Guild system loaded successfully!")
@@ -240,8 +240,13 @@ class House:
     purchase_date: float = field(default_factory=time.time)
     total_value: int = 0
     servants: List[Dict[str, Any]] = field(default_factory=list)
+    # item_id -> entry in storage, so stacks are found without scanning
+    _storage_index: Dict[str, Dict[str, Any]] = field(default_factory=dict, init=False, repr=False, compare=False)
     
     def __post_init__(self):
+        for stored in self.storage:
+            self._storage_index.setdefault(stored["item_id"], stored)
+        
         # Initialize default rooms based on house type
         if not self.rooms:
             self._init_default_rooms()
@@ -400,40 +405,43 @@ class House:
             return False, "Storage is full."
         
         # Check if item already exists
-        for stored in self.storage:
-            if stored["item_id"] == item.name:
-                stored["quantity"] += quantity
-                self.storage_used += quantity
-                return True, f"Stored {quantity}x {item.name}."
+        stored = self._storage_index.get(item.name)
+        if stored is not None:
+            stored["quantity"] += quantity
+            self.storage_used += quantity
+            return True, f"Stored {quantity}x {item.name}."
         
         # Add new item
-        self.storage.append({
+        stored = {
             "item_id": item.name,
             "name": item.name,
             "quantity": quantity,
             "rarity": item.rarity.name,
             "stored_at": time.time()
-        })
+        }
+        self.storage.append(stored)
+        self._storage_index[item.name] = stored
         self.storage_used += quantity
         
         return True, f"Stored {quantity}x {item.name}."
     
     def retrieve_item(self, item_id: str, quantity: int = 1) -> Tuple[bool, str, Optional[Dict]]:
         """Retrieve an item from storage"""
-        for stored in self.storage:
-            if stored["item_id"] == item_id:
-                if stored["quantity"] < quantity:
-                    return False, "Not enough quantity stored.", None
-                
-                stored["quantity"] -= quantity
-                self.storage_used -= quantity
-                
-                if stored["quantity"] <= 0:
-                    self.storage.remove(stored)
-                
-                return True, f"Retrieved {quantity}x {item_id}.", stored
+        stored = self._storage_index.get(item_id)
+        if stored is None:
+            return False, "Item not found in storage.", None
+        
+        if stored["quantity"] < quantity:
+            return False, "Not enough quantity stored.", None
+        
+        stored["quantity"] -= quantity
+        self.storage_used -= quantity
+        
+        if stored["quantity"] <= 0:
+            self.storage.remove(stored)
+            del self._storage_index[item_id]
         
-        return False, "Item not found in storage.", None
+        return True, f"Retrieved {quantity}x {item_id}.", stored
     
     def plant_seed(self, plot_id: str, seed_type: str) -> Tuple[bool, str]:
         """Plant a seed in garden plot"""
@@ -500,8 +500,9 @@ class PluginManager:
         """Load items from plugin"""
         items = getattr(plugin, 'items', {})
         if items:
-            from core.items import ITEM_DATABASE
+            from core.items import ITEM_DATABASE, _random_item_candidates
             ITEM_DATABASE.update(items)
+            _random_item_candidates.cache_clear()
             logger.info(f"Registered {len(items)} items from plugin {plugin.id}")
     
     def _load_recipes(self, plugin: Any):
@@ -513,7 +514,7 @@ class PluginManager:
                 for recipe_id, recipe_data in recipes.items():
                     recipe_data["id"] = recipe_id
                     recipe = CraftingRecipe.from_dict(recipe_data)
-                    self.game.crafting_manager.recipes[recipe_id] = recipe
+                    self.game.crafting_manager.add_recipe(recipe)
                 logger.info(f"Registered {len(recipes)} recipes from plugin {plugin.id}")
             except Exception as e:
                 logger.warning(f"Could not register recipes: {e}")